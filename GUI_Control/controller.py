@@ -4,7 +4,17 @@
 # 7/9/2025
 
 from User_Libraries.statisticsHelp import (SimpleStatisticsHelper,
-                                            advancedStatisticsHelper)
+                                            advancedStatisticsHelper,
+                                            TOKENIZER_ID)
+from User_Libraries.datasetHelp import Dataset, IncrementalParser
+from User_Libraries.sessionHelp import SessionHelper
+from User_Libraries.tableHelp import ColumnarTable
+from User_Libraries.plotHelp import (IncrementalHistogram, IncrementalMinMax,
+                                     boxPlotSegments, thinPoints)
+
+import gc
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 
 #import necessary GUI components directly from statsGui
@@ -14,12 +24,19 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer
 
+from GUI_Control.resultView import SequenceTableModel
+
 
 class controller:
     
     helper = SimpleStatisticsHelper()
     advHelper = advancedStatisticsHelper()
 
+    # result lists longer than this are shown in a ResultView instead of as text
+    inline_limit = 200
+    # milliseconds after the last edit before the dataset field is parsed again
+    live_parse_delay = 150
+
 
     def open_advanced_stats(self):
         """Open the Advanced Statistics dialog."""
@@ -31,6 +48,73 @@ class controller:
         from GUI_Control.statsGui import ExtraStatsDialog
         ExtraStatsDialog(self).exec()
 
+    def format_long_result(self, view, title, values):
+        """Text for a result list; long lists go to the virtualized view and only get counted here."""
+        if view is None or len(values) <= self.inline_limit:
+            if view is not None:
+                view.clear()
+            return str(values)
+        view.set_values(title, values)
+        return f"{len(values)} values (listed below)"
+
+    def open_plots(self):
+        """Open the Plots window for the current dataset, or refresh it if it is already open."""
+        data = self.get_data_list()
+        if data is None:
+            return
+        try:
+            # converted before the window is touched, so text tokens leave it as it was
+            values = np.asarray(data, dtype=np.float64)
+            from GUI_Control.statsGui import PlotDialog
+            if getattr(self, "plot_dialog", None) is None:
+                self.plot_dialog = PlotDialog(self)
+            self.plot_dialog.set_plot_data(values)
+        except Exception as e: #avoid crashing the GUI
+            QMessageBox.warning(self, "Plot Error", f"Only numerical datasets can be plotted: {e}")
+            return
+        live = self.live_dataset is not None and data is self.live_dataset.values
+        self.plotted_text = self.live_parser.text if live else None
+        self.plotted_count = len(data)
+        self.plot_dialog.show()
+        self.plot_dialog.raise_()
+
+    def set_plot_data(self, data):
+        """Replace the plotted dataset."""
+        self.plot_histogram = IncrementalHistogram()
+        self.plot_series = IncrementalMinMax()
+        self.plot_chunks = []
+        self.append_plot_data(data)
+
+    def append_plot_data(self, values):
+        """Add values to the plots without redrawing them from the raw points."""
+        values = np.asarray(values, dtype=np.float64)
+        self.plot_histogram.append(values)
+        self.plot_series.append(values)
+        self.plot_chunks.append(values)
+        self.box_stale = True
+        self.histogram_curve.setData(self.plot_histogram.edges(), self.plot_histogram.counts)
+        self.index_curve.setData(*self.plot_series.curve())
+        self.update_box_plot()
+
+    def update_box_plot(self):
+        """Redraw the box plot from findQuartiles, only while its tab is visible and the data changed."""
+        if not self.box_stale or self.tabs.currentWidget() is not self.box_plot:
+            return
+        if len(self.plot_chunks) > 1:
+            self.plot_chunks = [np.concatenate(self.plot_chunks)]
+        values = self.plot_chunks[0] if self.plot_chunks else np.empty(0)
+        self.box_stale = False
+        if len(values) == 0:
+            self.box_curve.setData([], [])
+            self.box_outliers.setData([], [])
+            return
+        q1, q2, q3, q4, iqr, lowerBound, upperBound, outliers = (
+            self.advHelper.findQuartiles(values)
+        )
+        self.box_curve.setData(*boxPlotSegments(values, q1, q2, q3, lowerBound, upperBound))
+        shown = thinPoints(outliers)
+        self.box_outliers.setData(np.zeros(len(shown)), shown)
+
     #run function in statisticshelp.py
     def show_frequency(self):
         text = self.freq_input.text().strip()
@@ -39,7 +123,10 @@ class controller:
             return
         try:
             # lowest_class_limit and class_width are spinboxes declared in statsGui.py
-            data = self.helper.datasetToList(text)
+            if getattr(self, "tokenized_data", None) is not None:
+                data = self.tokenized_data  # long token lists are not written back to the input
+            else:
+                data = self.helper.datasetToList(text)
             lowest = self.lowest_class_limit.value()
             width = self.class_width.value()
             import io
@@ -61,13 +148,142 @@ class controller:
             return
         try:
             result = self.advHelper.stemLeafToList(text)
-            self.stemleaf_output.setText(f"List: {result}")
+            listed = self.format_long_result(self.stemleaf_result_view, "List", result)
+            self.stemleaf_output.setText(f"List: {listed}")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", str(e))
+
+    def open_table_file(self):
+        """Parse a CSV file into column buffers and list its columns for grouping."""
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Open Table", "", "CSV Files (*.csv);;All Files (*)"
+        )
+        if not fname:
+            return
+        try:
+            self.table = ColumnarTable.fromCsv(fname)
         except Exception as e:
             QMessageBox.warning(self, "Error", str(e))
+            return
+        self.table_group_combo.clear()
+        self.table_group_combo.addItem("(No grouping)")
+        self.table_group_combo.addItems(list(self.table.columns))
+        self.set_table_model(None)
+
+    def set_table_model(self, model):
+        """Show model in the table statistics view and release the previous one."""
+        old = self.table_output.model()
+        self.table_output.setModel(model)
+        if old is not None:
+            old.deleteLater()
+
+    def show_table_statistics(self):
+        """Calculate the statistics of every column of the opened table, for every group at once."""
+        if getattr(self, "table", None) is None:
+            QMessageBox.warning(self, "Input Error", "Please open a CSV file.")
+            return
+        groupBy = None
+        if self.table_group_combo.currentIndex() > 0:
+            groupBy = self.table_group_combo.currentText()
+        try:
+            headers, rows = self.table.statisticsTable(groupBy)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+        # rows are built and formatted only as the view scrolls to them
+        self.set_table_model(SequenceTableModel(headers, rows, self.table_output))
+        self.table_output.resizeColumnsToContents()
+
+    def setup_live_parsing(self):
+        """Parse the dataset field while it is edited and show basic statistics as it changes."""
+        self.live_parser = IncrementalParser()
+        self.live_dataset = None
+        self.live_sort = None
+        # the field text and value count last drawn in the Plots window, for appending to it
+        self.plotted_text = None
+        self.plotted_count = 0
+        # one worker: only the newest dataset's sorted view is wanted
+        self.live_pool = ThreadPoolExecutor(max_workers=1)
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.live_parse_delay)
+        self.live_timer.timeout.connect(self.parse_dataset_input)
+        self.dataset_input.textChanged.connect(lambda text: self.live_timer.start())
+
+    def parse_dataset_input(self):
+        """Bring the live parse up to date with the dataset field; only the edited values are parsed again."""
+        self.live_timer.stop()
+        self.live_parser.update(self.dataset_input.text(), self.dataset_input.cursorPosition())
+        self.live_dataset = None
+        if self.live_sort is not None:
+            self.live_sort.cancel()
+            self.live_sort = None
+        if self.session_dataset is not None:
+            self.show_session_statistics()
+            return
+        if not self.live_parser.text.strip():
+            self.live_stats_label.clear()
+            return
+        if not self.live_parser.isValid():
+            self.live_stats_label.setText(f"{self.live_parser.invalidCount()} invalid value(s)")
+            return
+        summary = self.live_parser.summary()
+        self.live_stats_label.setText(
+            f"Count: {summary['count']}   Mean: {summary['mean']:.6g}   "
+            f"Min: {summary['min']:.6g}   Max: {summary['max']:.6g}   "
+            f"Std Dev: {summary['populationStandardDeviation']:.6g}"
+        )
+        # sort in the background, so median, quartiles and sessions find the sorted view ready
+        self.live_dataset = self.live_parser.dataset()
+        self.live_sort = self.live_pool.submit(self.live_dataset.sortedValues)
+        self.update_live_plot()
+
+    def update_live_plot(self):
+        """Keep an open Plots window on the live dataset; values typed after the end are only appended."""
+        plot_dialog = getattr(self, "plot_dialog", None)
+        if plot_dialog is None or not plot_dialog.isVisible():
+            self.plotted_text = None
+            return
+        text, plotted = self.live_parser.text, self.plotted_text
+        values = self.live_dataset.values
+        if (plotted is not None and text.startswith(self.live_parser.delimiter, len(plotted))
+                and text.startswith(plotted)):
+            plot_dialog.append_plot_data(values[self.plotted_count:])
+        else:
+            plot_dialog.set_plot_data(values)
+        self.plotted_text, self.plotted_count = text, len(values)
+
+    def dataset_of(self, data, sorted_view=False):
+        """
+        The Dataset behind data if it came from the live parse or a session, else data itself.
+        Pass sorted_view when the statistic sorts, to wait for the background sort instead of sorting twice.
+        """
+        if self.live_dataset is not None and data is self.live_dataset.values:
+            if sorted_view and self.live_sort is not None:
+                self.live_sort.result()
+            return self.live_dataset
+        session_dataset = getattr(self, "session_dataset", None)
+        if session_dataset is not None and data is session_dataset.values:
+            return session_dataset
+        return data
+
+    def live_statistic(self, data, name):
+        """A statistic of the live summary when data is the live dataset, otherwise computed by the helper."""
+        if self.live_dataset is not None and data is self.live_dataset.values:
+            return self.live_parser.summary()[name]
+        return getattr(self.helper, name)(self.dataset_of(data))
 
     def get_data_list(self):
         if self.tokenized_data is not None:
             return self.tokenized_data
+        if self.session_dataset is not None:
+            return self.session_dataset.values
+        # every edit starts the timer, so an idle timer means the parse is current; comparing
+        # the texts would copy the whole field out of Qt on every button press
+        if self.live_timer.isActive():
+            self.parse_dataset_input()
+        if self.live_dataset is not None:
+            return self.live_dataset.values
         text = self.dataset_input.text().strip()
         if not text:
             QMessageBox.warning(self, "Input Error", "Please enter a dataset.")
@@ -81,19 +297,19 @@ class controller:
     def show_mean(self):
         data = self.get_data_list()
         if data is not None:
-            result = self.helper.mean(data)
+            result = self.live_statistic(data, "mean")
             self.output_box.setText(f"Mean: {result}")
 
     def show_median(self):
         data = self.get_data_list()
         if data is not None:
-            result = self.helper.median(data)
+            result = self.helper.median(self.dataset_of(data, sorted_view=True))
             self.output_box.setText(f"Median: {result}")
 
     def show_mode(self):
         data = self.get_data_list()
         if data is not None:
-            result = self.helper.mode(data)
+            result = self.helper.mode(self.dataset_of(data))
             if result is None:
                 self.output_box.setText("Mode: No mode found (all values are unique)")
             else:
@@ -102,31 +318,48 @@ class controller:
     def show_range(self):
         data = self.get_data_list()
         if data is not None:
-            result = self.helper.range(data)
+            result = self.live_statistic(data, "range")
             self.output_box.setText(f"Range: {result}")
 
     def show_population_std(self):
         data = self.get_data_list()
         if data is not None:
-            result = self.helper.populationStandardDeviation(data)
+            result = self.live_statistic(data, "populationStandardDeviation")
             self.output_box.setText(f"Population Standard Deviation: {result}")
 
     def show_sample_std(self):
         data = self.get_data_list()
         if data is not None:
-            result = self.helper.sampleStandardDeviation(data)
+            result = self.live_statistic(data, "sampleStandardDeviation")
             self.output_box.setText(f"Sample Standard Deviation: {result}")
 
     def show_quartiles(self):
         data = self.get_data_list()
         if data is not None:
             q1, q2, q3, q4, iqr, lowerBound, upperBound, outliers = (
-                self.advHelper.findQuartiles(data)
+                self.advHelper.findQuartiles(self.dataset_of(data, sorted_view=True))
             )
+            outliers = self.format_long_result(self.result_view, "Outliers", outliers)
             self.output_box.setText(
                 f"Q1: {q1}\nQ2 (Median): {q2}\nQ3: {q3}\nQ4 (Max): {q4}\nIQR: {iqr}\nLower Bound: {lowerBound}\nUpper Bound: {upperBound}\nOutliers: {outliers}"
             )
 
+    def token_view_for(self, dataset):
+        """The ResultView that lists long token lists of a dataset input, if its tab has one."""
+        if getattr(self, "dataset_input", None) is dataset:
+            return self.result_view
+        if getattr(self, "quartiles_input", None) is dataset:
+            return self.quartiles_result_view
+        return None
+
+    def dataset_edited(self, text=None):
+        """A dataset field was edited by hand, so earlier tokens or an opened session no longer describe it."""
+        self.tokenized_data = None
+        if getattr(self, "session_dataset", None) is not None:
+            self.session_dataset = None
+            self.dataset_input.setPlaceholderText(self.dataset_placeholder)
+            self.result_view.clear()
+
     def handle_tokenize(self, dataset):
         self.tokenized_data = None
         dataset.setEnabled(False)  # Disable the input widget during processing
@@ -158,7 +391,16 @@ class controller:
             try:
                 tokens = self.helper.tokenize(text, alphaOrNum)
                 self.tokenized_data = tokens
-                dataset.setText(", ".join(str(t) for t in tokens))  # Update the correct widget
+                if len(tokens) <= self.inline_limit:
+                    dataset.setText(", ".join(str(t) for t in tokens))  # Update the correct widget
+                elif self.token_view_for(dataset) is not None:
+                    # long token lists stay out of the input box and are listed on demand
+                    self.token_view_for(dataset).set_values("Tokens", tokens)
+                else:
+                    QMessageBox.information(
+                        self, "Tokenized",
+                        f"{len(tokens)} tokens found. They are used until the dataset is edited.",
+                    )
             except Exception as e:
                 QMessageBox.warning(self, "Tokenization Error", str(e))
                 self.tokenized_data = None
@@ -190,6 +432,123 @@ class controller:
             except Exception as e:
                 QMessageBox.warning(self, "Save Error", str(e))
 
+    def save_session(self):
+        """Save the dataset, its sorted view, statistics and tokenizer settings as a binary snapshot."""
+        data = self.get_data_list()
+        if data is None:
+            return
+        fname, _ = QFileDialog.getSaveFileName(
+            self, "Save Session", "", "Session Snapshots (*.stats)"
+        )
+        if not fname:
+            return
+        try:
+            if self.session_dataset is not None and SessionHelper.isMappedFrom(self.session_dataset, fname):
+                # saving over the opened session: Windows cannot replace a file that is still mapped
+                self.release_session_file()
+                data = self.get_data_list()
+            dataset = self.dataset_of(data, sorted_view=True)
+            if not isinstance(dataset, Dataset):
+                try:
+                    dataset = Dataset(data)
+                except ValueError:
+                    raise ValueError("Only numerical datasets can be saved as a session.")
+            statistics = dataset.pipe().stats(
+                "count", "mean", "median", "mode", "range",
+                "populationStandardDeviation", "sampleStandardDeviation",
+            )
+            # also stores the sorted view in the snapshot
+            q1, q2, q3, q4, iqr, lowerBound, upperBound = dataset.quartiles()
+            statistics.update(q1=q1, q3=q3, iqr=iqr, lowerBound=lowerBound, upperBound=upperBound)
+            tokenizer = {
+                "name": TOKENIZER_ID,
+                "alphaOrNum": self.tokenized_type,
+                "tokenized": self.tokenized_data is not None,
+            }
+            SessionHelper.saveSnapshot(
+                fname, dataset, statistics, tokenizer, self.output_box.toPlainText()
+            )
+            QMessageBox.information(self, "Saved", f"Session saved to {fname}")
+        except Exception as e:
+            QMessageBox.warning(self, "Save Error", str(e))
+
+    def release_session_file(self):
+        """Copy the opened session into memory and drop every reference to its mapped file."""
+        mapped = self.session_dataset
+        sorted_values = mapped.cachedSortedValues()
+        self.session_dataset = Dataset(
+            np.array(mapped.values), None if sorted_values is None else np.array(sorted_values)
+        )
+        if self.result_view.values is mapped.values:
+            self.result_view.set_values("Dataset", self.session_dataset.values)
+        plot_dialog = getattr(self, "plot_dialog", None)
+        if plot_dialog is not None and any(np.may_share_memory(chunk, mapped.values)
+                                           for chunk in plot_dialog.plot_chunks):
+            plot_dialog.set_plot_data(self.session_dataset.values)
+        del mapped, sorted_values
+        gc.collect()
+
+    def show_session_statistics(self):
+        """Show the statistics stored in the opened session, without computing them again."""
+        # snapshots saved through SessionHelper may hold any subset of the statistics
+        stats = self.session_statistics if isinstance(self.session_statistics, dict) else {}
+        parts = [f"Count: {stats.get('count', len(self.session_dataset))}"]
+        for label, key in (("Mean", "mean"), ("Median", "median"),
+                           ("Std Dev", "populationStandardDeviation"), ("IQR", "iqr")):
+            value = stats.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                parts.append(f"{label}: {value:.6g}")
+        self.live_stats_label.setText("Session - " + "   ".join(parts))
+
+    def open_session(self):
+        """Open a binary snapshot; the dataset is memory mapped, so this is quick for any size."""
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Open Session", "", "Session Snapshots (*.stats)"
+        )
+        if not fname:
+            return
+        try:
+            session = SessionHelper.loadSnapshot(fname)
+        except Exception as e:
+            QMessageBox.warning(self, "Open Error", str(e))
+            return
+        dataset = session["dataset"]
+        # the session is used until the dataset field is edited (see dataset_edited)
+        self.session_dataset = dataset
+        self.session_statistics = session["statistics"]
+        self.tokenized_data = None
+        self.tokenized_type = session["tokenizer"].get("alphaOrNum", 3)
+        self.tokenizer_type_combo.setCurrentIndex({3: 0, 1: 1, 2: 2}.get(self.tokenized_type, 0))
+        if len(dataset) <= self.inline_limit:
+            self.dataset_input.setText(", ".join(str(v) for v in dataset.values.tolist()))
+            self.dataset_input.setPlaceholderText(self.dataset_placeholder)
+            self.result_view.clear()
+        else:
+            self.dataset_input.clear()
+            self.dataset_input.setPlaceholderText(f"Dataset loaded from session ({len(dataset)} values)")
+            self.result_view.set_values("Dataset", dataset.values)
+        self.output_box.setText(session["output"])
+        self.show_session_statistics()
+
+    def export_data(self):
+        """Export the dataset to CSV or JSON, written in chunks."""
+        data = self.get_data_list()
+        if data is None:
+            return
+        fname, selected = QFileDialog.getSaveFileName(
+            self, "Export Data", "", "CSV Files (*.csv);;JSON Files (*.json)"
+        )
+        if not fname:
+            return
+        try:
+            if fname.lower().endswith(".json") or (selected.startswith("JSON") and not fname.lower().endswith(".csv")):
+                SessionHelper.exportJson(fname, data)
+            else:
+                SessionHelper.exportCsv(fname, data)
+            QMessageBox.information(self, "Exported", f"Data exported to {fname}")
+        except Exception as e:
+            QMessageBox.warning(self, "Export Error", str(e))
+
     def show_z_score(self):
         """Calculate and display z-score for a value in a dataset."""
         # Check if we have tokenized data, otherwise use text input
@@ -242,6 +601,7 @@ class controller:
             q1, q2, q3, q4, iqr, lowerBound, upperBound, outliers = (
                 self.advHelper.findQuartiles(data)
             )
+            outliers = self.format_long_result(self.quartiles_result_view, "Outliers", outliers)
             self.quartiles_output.setText(
                 f"Q1: {q1}\nQ2 (Median): {q2}\nQ3: {q3}\nQ4 (Max): {q4}\nIQR: {iqr}\nLower Bound: {lowerBound}\nUpper Bound: {upperBound}\nOutliers: {outliers}"
             )
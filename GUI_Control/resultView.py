@@ -0,0 +1,197 @@
+#resultView.py
+#Virtualized view for long result lists (tokens, outliers, stem-and-leaf values) and result tables
+# 10/19/2026
+#Rows are formatted only when the list view asks for them, and the list itself is only
+#created when the user expands the summary, so a huge result never becomes one big string.
+
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QListView,
+    QApplication,
+    QFileDialog,
+    QMessageBox,
+)
+from PyQt6.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex
+
+
+def format_value(value):
+    """Format one value like the text outputs do."""
+    return str(value)
+
+
+def iter_text_chunks(values, separator, chunk_size=65536):
+    """Yield the values as text a chunk at a time, joined by separator."""
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        if hasattr(chunk, "tolist"):
+            chunk = chunk.tolist()
+        text = separator.join(format_value(v) for v in chunk)
+        yield text if start == 0 else separator + text
+
+
+class SequenceListModel(QAbstractListModel):
+    """List model over a python list or numpy array, loaded a page at a time."""
+
+    page_size = 1000
+
+    def __init__(self, values, parent=None):
+        super().__init__(parent)
+        self.values = values
+        self.loaded = min(self.page_size, len(values))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return format_value(self.values[index.row()])
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.values)
+
+    def fetchMore(self, parent):
+        count = min(self.page_size, len(self.values) - self.loaded)
+        self.beginInsertRows(parent, self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+
+def format_cell(value):
+    """Format one table cell: floats to four places, missing values as blanks."""
+    if value is None:
+        return ""
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+
+class SequenceTableModel(QAbstractTableModel):
+    """Table model over a sequence of rows, loaded a page at a time; a row is only read when shown."""
+
+    page_size = 1000
+
+    def __init__(self, headers, rows, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.rows = rows
+        self.loaded = min(self.page_size, len(rows))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return format_cell(self.rows[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.rows)
+
+    def fetchMore(self, parent):
+        count = min(self.page_size, len(self.rows) - self.loaded)
+        self.beginInsertRows(parent, self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+
+class ResultView(QWidget):
+    """Summary of a long list of values that can be expanded, copied or exported."""
+
+    preview_count = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = []
+        self.title = ""
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.summary = QLabel()
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+
+        buttons = QHBoxLayout()
+        self.expand_btn = QPushButton("Show All")
+        self.expand_btn.clicked.connect(self.toggle_expanded)
+        buttons.addWidget(self.expand_btn)
+        copy_btn = QPushButton("Copy")
+        copy_btn.clicked.connect(self.copy_values)
+        buttons.addWidget(copy_btn)
+        export_btn = QPushButton("Export")
+        export_btn.clicked.connect(self.export_values)
+        buttons.addWidget(export_btn)
+        layout.addLayout(buttons)
+
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)  # lets the view skip measuring every row
+        self.list_view.setVisible(False)
+        layout.addWidget(self.list_view)
+        self.setLayout(layout)
+        self.setVisible(False)
+
+    def set_values(self, title, values):
+        """Show a summary of values; rows are only formatted once the list is expanded."""
+        self.title = title
+        self.values = values
+        preview = ", ".join(format_value(v) for v in values[:self.preview_count])
+        more = ", ..." if len(values) > self.preview_count else ""
+        self.summary.setText(f"{title}: {len(values)} values\n[{preview}{more}]")
+        self.drop_model()
+        self.list_view.setVisible(False)
+        self.expand_btn.setText("Show All")
+        self.setVisible(True)
+
+    def drop_model(self):
+        """Detach the list model; it is parented to the view, so its values are released explicitly."""
+        model = self.list_view.model()
+        self.list_view.setModel(None)
+        if model is not None:
+            model.values = []
+            model.deleteLater()
+
+    def clear(self):
+        self.values = []
+        self.drop_model()
+        self.setVisible(False)
+
+    def toggle_expanded(self):
+        if self.list_view.isVisible():
+            self.list_view.setVisible(False)
+            self.expand_btn.setText("Show All")
+            return
+        if self.list_view.model() is None:
+            self.list_view.setModel(SequenceListModel(self.values, self.list_view))
+        self.list_view.setVisible(True)
+        self.expand_btn.setText("Hide")
+
+    def copy_values(self):
+        """Copy the values as a comma separated list that can be pasted back as a dataset."""
+        QApplication.clipboard().setText("".join(iter_text_chunks(self.values, ", ")))
+
+    def export_values(self):
+        """Write the values to a file one per line, a chunk at a time."""
+        fname, _ = QFileDialog.getSaveFileName(
+            self, f"Export {self.title}", "", "Text Files (*.txt);;CSV Files (*.csv)"
+        )
+        if not fname:
+            return
+        try:
+            with open(fname, "w", encoding="utf-8") as f:
+                for chunk in iter_text_chunks(self.values, "\n"):
+                    f.write(chunk)
+                f.write("\n")
+        except Exception as e:
+            QMessageBox.warning(self, "Export Error", str(e))
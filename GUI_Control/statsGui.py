@@ -17,6 +17,7 @@ from PyQt6.QtWidgets import (
     QSpinBox,
     QDialog,
     QTabWidget,
+    QTableView,
 )
 
 import pyqtgraph as pg
@@ -25,6 +26,7 @@ import numpy as np
 
 # Local imports
 from GUI_Control.controller import controller
+from GUI_Control.resultView import ResultView
 
 class AdvancedStatsDialog(QDialog, controller):
     def __init__(self, parent=None):
@@ -42,6 +44,7 @@ class AdvancedStatsDialog(QDialog, controller):
         quartiles_layout = QFormLayout()
         self.quartiles_input = QLineEdit()
         self.quartiles_input.setPlaceholderText("Enter numbers separated by commas")
+        self.quartiles_input.textEdited.connect(self.dataset_edited)
         quartiles_layout.addRow("Dataset:", self.quartiles_input)
         
         # Tokenizer type dropdown for quartiles
@@ -59,6 +62,10 @@ class AdvancedStatsDialog(QDialog, controller):
         self.quartiles_output = QTextEdit()
         self.quartiles_output.setReadOnly(True)
         quartiles_layout.addRow(self.quartiles_output)
+
+        # Long outlier lists are shown here instead of in the text output
+        self.quartiles_result_view = ResultView()
+        quartiles_layout.addRow(self.quartiles_result_view)
         
         # Button to calculate quartiles
         quartiles_btn = QPushButton("Calculate Quartiles")
@@ -70,6 +77,7 @@ class AdvancedStatsDialog(QDialog, controller):
         zscore_layout = QFormLayout()
         self.zscore_dataset_input = QLineEdit()
         self.zscore_dataset_input.setPlaceholderText("Enter numbers separated by commas")
+        self.zscore_dataset_input.textEdited.connect(self.dataset_edited)
         zscore_layout.addRow("Dataset:", self.zscore_dataset_input)
         
         # Tokenizer type dropdown for z-score
@@ -117,11 +125,13 @@ class ExtraStatsDialog(QDialog, controller):
         self.tabs = QTabWidget()
         self.freq_tab = QWidget()
         self.stemleaf_tab = QWidget()
+        self.table_tab = QWidget()
 
         # Frequency Distribution Tab
         freq_layout = QFormLayout()
         self.freq_input = QLineEdit()
         self.freq_input.setPlaceholderText("Enter numbers and tokenize them")
+        self.freq_input.textEdited.connect(self.dataset_edited)
         freq_layout.addRow("Dataset:", self.freq_input)
 
         # Tokenizer type dropdown
@@ -168,19 +178,79 @@ class ExtraStatsDialog(QDialog, controller):
         self.stemleaf_output = QTextEdit()
         self.stemleaf_output.setReadOnly(True)
         stem_layout.addRow(self.stemleaf_output)
+        self.stemleaf_result_view = ResultView()
+        stem_layout.addRow(self.stemleaf_result_view)
         stem_btn = QPushButton("Convert to List")
         stem_btn.clicked.connect(self.show_stemleaf_to_list)
         stem_layout.addRow(stem_btn)
         self.stemleaf_tab.setLayout(stem_layout)
 
+        # Table Statistics Tab
+        table_layout = QFormLayout()
+        table_open_btn = QPushButton("Open CSV File")
+        table_open_btn.clicked.connect(self.open_table_file)
+        table_layout.addRow(table_open_btn)
+
+        # Group-by dropdown, filled with the columns of the opened file
+        self.table_group_combo = QComboBox()
+        self.table_group_combo.addItem("(No grouping)")
+        table_layout.addRow("Group By:", self.table_group_combo)
+        self.table_output = QTableView()
+        table_layout.addRow(self.table_output)
+        table_btn = QPushButton("Calculate Column Statistics")
+        table_btn.clicked.connect(self.show_table_statistics)
+        table_layout.addRow(table_btn)
+        self.table_tab.setLayout(table_layout)
+
         # Add tabs to the main layout
         self.tabs.addTab(self.freq_tab, "Frequency Table")
         self.tabs.addTab(self.stemleaf_tab, "Stem-and-Leaf")
+        self.tabs.addTab(self.table_tab, "Table Statistics")
 
         layout.addWidget(self.tabs)
         self.setLayout(layout)
 
 
+class PlotDialog(QDialog, controller):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Plots")
+        self.resize(700, 500)
+
+        # create the main layout and tabs
+        layout = QVBoxLayout()
+        self.tabs = QTabWidget()
+
+        # Histogram Tab, drawn from binned counts
+        self.histogram_plot = pg.PlotWidget()
+        self.histogram_plot.setLabel("bottom", "Value")
+        self.histogram_plot.setLabel("left", "Frequency")
+        self.histogram_curve = self.histogram_plot.plot(
+            [0, 1], [0], stepMode="center", fillLevel=0, brush=(100, 100, 255, 150)
+        )
+
+        # Box Plot Tab, drawn from the quartiles and fences
+        self.box_plot = pg.PlotWidget()
+        self.box_plot.setLabel("left", "Value")
+        self.box_plot.getAxis("bottom").setTicks([[]])
+        self.box_curve = self.box_plot.plot([], [], connect="pairs", pen=pg.mkPen(width=2))
+        self.box_outliers = self.box_plot.plot([], [], pen=None, symbol="o", symbolSize=5)
+
+        # Index Tab, drawn from the min and max of each bucket of points
+        self.index_plot = pg.PlotWidget()
+        self.index_plot.setLabel("bottom", "Index")
+        self.index_plot.setLabel("left", "Value")
+        self.index_curve = self.index_plot.plot([], [])
+
+        # Add tabs to the main layout
+        self.tabs.addTab(self.histogram_plot, "Histogram")
+        self.tabs.addTab(self.box_plot, "Box Plot")
+        self.tabs.addTab(self.index_plot, "Index")
+        self.tabs.currentChanged.connect(self.update_box_plot)
+
+        layout.addWidget(self.tabs)
+        self.setLayout(layout)
+
 
 class StatsApp(QWidget, controller):
     def __init__(self):
@@ -193,11 +263,18 @@ class StatsApp(QWidget, controller):
 
         # Dataset input
         self.dataset_input = QLineEdit()
-        self.dataset_input.setPlaceholderText(
-            "Enter numbers separated by commas (e.g. 1,2,3,4)"
-        )
+        self.dataset_placeholder = "Enter numbers separated by commas (e.g. 1,2,3,4)"
+        self.dataset_input.setPlaceholderText(self.dataset_placeholder)
+        # typing replaces tokens or an opened session; tokenize's own setText does not count
+        self.dataset_input.textEdited.connect(self.dataset_edited)
+        # the default limit of 32767 characters would cut off large pasted datasets
+        self.dataset_input.setMaxLength(2**31 - 1)
         form_layout.addRow("Dataset:", self.dataset_input)
 
+        # Count, mean, min, max and std dev, updated as the dataset is typed or pasted
+        self.live_stats_label = QLabel()
+        form_layout.addRow("", self.live_stats_label)
+
         # Tokenizer type dropdown
         self.tokenizer_type_combo = QComboBox()
         self.tokenizer_type_combo.addItems(
@@ -255,11 +332,29 @@ class StatsApp(QWidget, controller):
         iqr_ops_layout.addWidget(btn_extra)
 
 
+        # Plots (opens window)
+        btn_plots = QPushButton("Plots")
+        btn_plots.clicked.connect(self.open_plots)
+        iqr_ops_layout.addWidget(btn_plots)
+
         # Save Data Button
         btn_save = QPushButton("Save Data & Output")
         btn_save.clicked.connect(self.save_data_output)
         iqr_ops_layout.addWidget(btn_save)
 
+        # Session snapshots and export
+        btn_save_session = QPushButton("Save Session")
+        btn_save_session.clicked.connect(self.save_session)
+        iqr_ops_layout.addWidget(btn_save_session)
+
+        btn_open_session = QPushButton("Open Session")
+        btn_open_session.clicked.connect(self.open_session)
+        iqr_ops_layout.addWidget(btn_open_session)
+
+        btn_export = QPushButton("Export Data")
+        btn_export.clicked.connect(self.export_data)
+        iqr_ops_layout.addWidget(btn_export)
+
         main_layout.addLayout(form_layout)
         main_layout.addWidget(QLabel("Numerical Operations:"))
         main_layout.addLayout(num_ops_layout)
@@ -267,9 +362,16 @@ class StatsApp(QWidget, controller):
         main_layout.addLayout(iqr_ops_layout)
         main_layout.addWidget(QLabel("Output:"))
         main_layout.addWidget(self.output_box)
+
+        # Long results (tokens, outliers) are shown here instead of in the output box
+        self.result_view = ResultView()
+        main_layout.addWidget(self.result_view)
         self.setLayout(main_layout)
 
         # Internal state
         self.tokenized_data = None
         self.tokenized_type = 3  # 3 = both, 1 = alpha, 2 = num
+        self.session_dataset = None
+        self.session_statistics = None
+        self.setup_live_parsing()
 
@@ -0,0 +1,140 @@
+#serviceLoadTest.py
+#Load test for the local statistics service (service.py). Reports p50/p99 latency and throughput.
+# 10/19/2026
+#Example:
+#    py service.py
+#    py Unit_Tests/serviceLoadTest.py --operation mean --concurrency 64 --requests 2000
+#or start a temporary instance on a free port with --spawn.
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+
+async def send(reader, writer, host, path, body):
+    """Send one keep-alive POST and return the decoded JSON response."""
+    data = json.dumps(body).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    payload = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"{status}: {payload.get('error')}")
+    return payload
+
+
+def request_body(args, dataset_id, index):
+    if args.operation == "tokenize":
+        # different texts per request, so the token cache does not hide the tokenizer cost
+        return {"text": ", ".join(str(random.randint(0, 999)) for _ in range(args.size)) + f" {index}",
+                "alphaOrNum": 2}
+    body = {"datasetId": dataset_id}
+    if args.operation == "zScore":
+        body["value"] = 0.5
+    return body
+
+
+async def client(args, dataset_id, counter, latencies, errors):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        while True:
+            index = counter[0]
+            if index >= args.requests:
+                break
+            counter[0] += 1
+            body = request_body(args, dataset_id, index)
+            start = time.perf_counter()
+            try:
+                await send(reader, writer, args.host, f"/{args.operation}", body)
+                latencies.append(time.perf_counter() - start)
+            except RuntimeError as e:
+                errors.append(str(e))
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run(args):
+    dataset_id = None
+    if args.operation != "tokenize":
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+        data = [random.gauss(0, 1) for _ in range(args.size)]
+        dataset_id = (await send(reader, writer, args.host, "/datasets", {"data": data}))["datasetId"]
+        writer.close()
+
+    counter, latencies, errors = [0], [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, dataset_id, counter, latencies, errors)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"operation:   {args.operation} ({args.size} values per request dataset)")
+    print(f"requests:    {len(latencies)} ok, {len(errors)} failed, concurrency {args.concurrency}")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} requests/s")
+    if latencies:
+        print(f"latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+        print(f"latency p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+    if errors:
+        print(f"first error: {errors[0]}")
+
+
+def spawn_service():
+    """Start service.py on a free localhost port and wait until it accepts connections."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, os.path.join(root, "service.py"), "--port", str(port)], cwd=root)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("The service did not start.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the statistics service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--operation", default="mean")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=1000, help="values in the dataset (or per tokenize text)")
+    parser.add_argument("--spawn", action="store_true", help="start a temporary service instance")
+    args = parser.parse_args()
+
+    service = None
+    if args.spawn:
+        service, args.port = spawn_service()
+    try:
+        asyncio.run(run(args))
+    finally:
+        if service is not None:
+            # Ctrl+C lets the service shut its worker pools down; Windows can only terminate it
+            service.send_signal(signal.SIGINT if os.name == "posix" else signal.SIGTERM)
+            service.wait()
@@ -2,4 +2,337 @@ from User_Libraries.statisticsHelp import (    SimpleStatisticsHelper,
     advancedStatisticsHelper
     )
 
-##
\ No newline at end of file
+##
+# Regression tests for the array helpers, each compared against a plain recomputation,
+# and for the on-disk caches and session files, each run in a temporary directory.
+#Run from the repository root with
+#    py -m unittest Unit_Tests/unitTesting.py
+import csv
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+import warnings
+from unittest import mock
+
+import numpy as np
+
+from User_Libraries.bootstrapHelp import BootstrapHelper, _quartileRows
+from User_Libraries.datasetHelp import Dataset, IncrementalParser
+from User_Libraries.outlierHelp import OutOfCoreOutlierHelper
+from User_Libraries.sessionHelp import SessionHelper
+from User_Libraries.tableHelp import ColumnarTable
+from User_Libraries.tokenCache import TokenCache
+
+
+def randomData(rng, n):
+    """Values with plenty of ties, so rank handling is exercised as well."""
+    return [float(rng.choice([rng.randint(-5, 5), round(rng.gauss(0, 50), 2)])) for _ in range(n)]
+
+
+class QuartileRowsTest(unittest.TestCase):
+    def test_matches_findQuartiles_for_every_row(self):
+        rng = random.Random(26)
+        for n in range(1, 40):
+            rows = np.array([randomData(rng, n) for _ in range(5)])
+            q1, q3 = _quartileRows(rows)
+            for row, rowQ1, rowQ3 in zip(rows.tolist(), q1, q3):
+                expected = advancedStatisticsHelper().findQuartiles(row)
+                self.assertEqual((rowQ1, rowQ3), (expected[0], expected[2]), (n, row))
+
+
+class ConfidenceIntervalTest(unittest.TestCase):
+    def test_sample_std_of_one_value_is_refused(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # no RuntimeWarning before the error either
+            with self.assertRaises(ValueError):
+                BootstrapHelper.confidenceInterval([5.0], "sampleStandardDeviation", resamples=10)
+            estimate, lower, upper = BootstrapHelper.confidenceInterval(
+                [5.0, 7.0], "sampleStandardDeviation", resamples=50, seed=26
+            )
+        self.assertAlmostEqual(estimate, SimpleStatisticsHelper.sampleStandardDeviation([5.0, 7.0]))
+        self.assertLessEqual(lower, upper)
+        # the other statistics are defined for a single value
+        self.assertEqual(BootstrapHelper.confidenceInterval([5.0], "mean", resamples=10), (5.0, 5.0, 5.0))
+
+
+class FindQuartilesTest(unittest.TestCase):
+    def test_list_and_array_inputs_agree(self):
+        rng = random.Random(31)
+        for n in range(1, 60):
+            data = randomData(rng, n)
+            fromList = advancedStatisticsHelper().findQuartiles(data)
+            fromArray = advancedStatisticsHelper().findQuartiles(np.array(data))
+            self.assertEqual(list(fromList), list(fromArray), data)
+
+    def test_single_value_is_its_own_quartiles(self):
+        self.assertEqual(advancedStatisticsHelper().findQuartiles([5.0]), (5.0, 5.0, 5.0, 5.0, 0.0, 5.0, 5.0, []))
+
+
+class OutOfCoreOutlierTest(unittest.TestCase):
+    def setUp(self):
+        self.runValues = OutOfCoreOutlierHelper.runValues
+        OutOfCoreOutlierHelper.runValues = 7  # many small runs
+        handle, self.path = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+
+    def tearDown(self):
+        OutOfCoreOutlierHelper.runValues = self.runValues
+        os.remove(self.path)
+
+    def writeData(self, data):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(",".join(repr(v) for v in data))
+
+    def test_selectRank_matches_sorted_position(self):
+        rng = random.Random(28)
+        for _ in range(200):
+            runs = [np.sort(randomData(rng, rng.randint(1, 12))) for _ in range(rng.randint(1, 4))]
+            merged = np.sort(np.concatenate(runs))
+            rank = rng.randrange(len(merged))
+            value = OutOfCoreOutlierHelper._selectRank(runs, rank, merged[0], merged[-1])
+            self.assertEqual(value, merged[rank])
+
+    def test_fences_match_findQuartiles(self):
+        rng = random.Random(280)
+        for n in range(1, 60):
+            data = randomData(rng, n)
+            self.writeData(data)
+            q1, q2, q3, q4, iqr, lowerBound, upperBound, outliers = advancedStatisticsHelper().findQuartiles(data)
+            for method in ("exact", "approximate"):
+                # the file is smaller than the sample, so the approximate pass is exact as well
+                fences = OutOfCoreOutlierHelper.findFences(self.path, method, chunkBytes=64)
+                self.assertEqual(
+                    (fences["q1"], fences["q2"], fences["q3"], fences["q4"]), (q1, q2, q3, q4), (method, data)
+                )
+                self.assertEqual((fences["lowerBound"], fences["upperBound"]), (lowerBound, upperBound))
+            found = [value for _, value in OutOfCoreOutlierHelper.iterOutliers(self.path, lowerBound, upperBound)]
+            self.assertEqual(sorted(found), outliers)
+
+
+class ColumnarTableTest(unittest.TestCase):
+    def setUp(self):
+        self.blockRows = ColumnarTable.blockRows
+        ColumnarTable.blockRows = 2  # every few rows start a new block
+
+    def tearDown(self):
+        ColumnarTable.blockRows = self.blockRows
+
+    def test_text_after_a_numeric_block_keeps_the_original_cells(self):
+        table = ColumnarTable.fromCsvText("k,v\n1,1\n001,2\n1,3\nA,4\n1,5\n,6")
+        self.assertEqual(table.columns["k"].tolist(), ["1", "001", "1", "A", "1", ""])
+        self.assertEqual(table.numericColumns(), ["v"])
+        headers, rows = table.statisticsTable("k")
+        counts = {row[0]: row[2] for row in rows}
+        self.assertEqual(counts, {"": 1, "001": 1, "1": 3, "A": 1})
+
+    def test_grouped_statistics_match_the_helpers_per_group(self):
+        rng = random.Random(29)
+        keys = [rng.choice("abcd") for _ in range(80)]
+        values = randomData(rng, 80)
+        values[::7] = [float("nan")] * len(values[::7])  # missing cells
+        headers, rows = ColumnarTable({"k": np.array(keys), "v": np.array(values)}).statisticsTable("k")
+        self.assertEqual(headers[:3], ["k", "Column", "Count"])
+        for key, name, count, mean, median, mode, valueRange, populationStd, sampleStd, q1, q3, *_ in rows:
+            data = [v for k, v in zip(keys, values) if k == key and v == v]
+            self.assertEqual(count, len(data))
+            self.assertAlmostEqual(mean, SimpleStatisticsHelper.mean(data))
+            self.assertEqual(median, SimpleStatisticsHelper.median(data))
+            expectedMode = SimpleStatisticsHelper.mode(data)
+            # several modes are listed in ascending order here, in order of appearance by the helper
+            self.assertEqual(mode, sorted(expectedMode) if isinstance(expectedMode, list) else expectedMode)
+            self.assertEqual(valueRange, SimpleStatisticsHelper.range(data))
+            self.assertAlmostEqual(sampleStd, SimpleStatisticsHelper.sampleStandardDeviation(data))
+            expected = advancedStatisticsHelper().findQuartiles(data)
+            self.assertEqual((q1, q3), (expected[0], expected[2]))
+
+
+class TokenCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def files(self, suffix):
+        return sorted(name for name in os.listdir(self.directory.name) if name.endswith(suffix))
+
+    def age(self, path, seconds):
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_encode_decode_round_trip(self):
+        for tokens in ([1.5, -2.0, 1e300], ["the", "naïve", "😀", ""], [], ["1", "2"]):
+            self.assertEqual(TokenCache._decode(TokenCache._encode(tokens)), tokens)
+        with self.assertRaises(ValueError):
+            TokenCache._decode(TokenCache._encode(["abc", "de"])[:-1])
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("a b", "tok", 1))
+        self.cache.put("a b", "tok", 1, ["a", "b"])
+        self.assertEqual(self.cache.get("a b", "tok", 1), ["a", "b"])
+        # another mode or tokenizer is another entry
+        self.assertIsNone(self.cache.get("a b", "tok", 2))
+        self.assertIsNone(self.cache.get("a b", "other", 1))
+
+    def test_evicts_least_recently_used_first(self):
+        entrySize = len(TokenCache._encode(["x" * 100]))
+        self.cache.maxBytes = int(2.5 * entrySize)  # room for two entries
+        self.cache.put("a", "tok", 1, ["a" * 100])
+        self.cache.put("b", "tok", 1, ["b" * 100])
+        self.age(self.cache._path(self.cache.key("a", "tok", 1)), 100)
+        self.age(self.cache._path(self.cache.key("b", "tok", 1)), 50)
+        self.cache.get("a", "tok", 1)  # reading "a" makes "b" the least recently used
+        self.cache.put("c", "tok", 1, ["c" * 100])
+        self.assertIsNone(self.cache.get("b", "tok", 1))
+        self.assertEqual(self.cache.get("a", "tok", 1), ["a" * 100])
+        self.assertEqual(self.cache.get("c", "tok", 1), ["c" * 100])
+
+    def test_put_replaces_atomically(self):
+        self.cache.put("a", "tok", 1, ["old"])
+        self.cache.put("a", "tok", 1, ["new"])
+        self.assertEqual(self.cache.get("a", "tok", 1), ["new"])
+        self.assertEqual(self.files(".tmp"), [])
+        # a failed rename keeps the previous entry and removes the temporary file
+        with mock.patch("User_Libraries.tokenCache.os.replace", side_effect=OSError):
+            self.cache.put("a", "tok", 1, ["newer"])
+        self.assertEqual(self.cache.get("a", "tok", 1), ["new"])
+        self.assertEqual(self.files(".tmp"), [])
+
+    def test_temporary_files_count_and_stale_ones_are_removed(self):
+        self.cache.put("a", "tok", 1, ["a" * 100])
+        self.cache.maxBytes = 2 * os.path.getsize(self.cache._path(self.cache.key("a", "tok", 1)))
+        writing = os.path.join(self.directory.name, "writing.tmp")
+        abandoned = os.path.join(self.directory.name, "abandoned.tmp")
+        for path in (writing, abandoned):
+            with open(path, "wb") as f:
+                f.write(b"\0" * self.cache.maxBytes)
+        self.age(abandoned, 2 * TokenCache.staleSeconds)
+        self.cache.evict()
+        # the abandoned file is deleted; the one still being written stays but fills the cache
+        self.assertEqual(self.files(".tmp"), ["writing.tmp"])
+        self.assertEqual(self.files(".tok"), [])
+
+
+class SessionHelperTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.stats")
+        self.exportChunk = SessionHelper.exportChunk
+        SessionHelper.exportChunk = 3  # several chunks even for short lists
+
+    def tearDown(self):
+        SessionHelper.exportChunk = self.exportChunk
+        gc.collect()  # release any mapping of the snapshot before its directory is removed
+        self.directory.cleanup()
+
+    def test_snapshot_round_trip(self):
+        values = randomData(random.Random(33), 50)
+        dataset = Dataset(values)
+        dataset.sortedValues()
+        SessionHelper.saveSnapshot(self.path, dataset, {"mean": 1.5}, {"alphaOrNum": 2}, "Mean: 1.5")
+        session = SessionHelper.loadSnapshot(self.path)
+        self.assertEqual(session["dataset"].values.tolist(), values)
+        self.assertEqual(session["dataset"].cachedSortedValues().tolist(), sorted(values))
+        self.assertEqual(session["statistics"], {"mean": 1.5})
+        self.assertEqual(session["tokenizer"], {"alphaOrNum": 2})
+        self.assertEqual(session["output"], "Mean: 1.5")
+        self.assertTrue(SessionHelper.isMappedFrom(session["dataset"], self.path))
+
+    def test_snapshot_without_sorted_view_or_values(self):
+        SessionHelper.saveSnapshot(self.path, [3.0, 1.0])
+        session = SessionHelper.loadSnapshot(self.path)
+        self.assertIsNone(session["dataset"].cachedSortedValues())
+        self.assertEqual((session["statistics"], session["tokenizer"], session["output"]), ({}, {}, ""))
+        del session
+        SessionHelper.saveSnapshot(self.path, [])
+        self.assertEqual(len(SessionHelper.loadSnapshot(self.path)["dataset"]), 0)
+
+    def test_failed_save_keeps_the_previous_snapshot(self):
+        SessionHelper.saveSnapshot(self.path, [1.0])
+        with mock.patch("User_Libraries.sessionHelp.os.replace", side_effect=OSError):
+            with self.assertRaises(OSError):
+                SessionHelper.saveSnapshot(self.path, [2.0])
+        self.assertEqual(SessionHelper.loadSnapshot(self.path)["dataset"].values.tolist(), [1.0])
+        self.assertEqual(os.listdir(self.directory.name), ["session.stats"])
+
+    def test_load_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"1, 2, 3")
+        with self.assertRaises(ValueError):
+            SessionHelper.loadSnapshot(self.path)
+
+    def test_exports(self):
+        values = [0.1, 1e-300, -2.0, 3.0, 1 / 3, 5.0, 7.25]
+        jsonPath = os.path.join(self.directory.name, "values.json")
+        SessionHelper.exportJson(jsonPath, np.array(values), {"count": 7})
+        with open(jsonPath, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"statistics": {"count": 7}, "values": values})
+        with self.assertRaises(ValueError):
+            SessionHelper.exportJson(jsonPath, [1.0, float("nan")])
+
+        csvPath = os.path.join(self.directory.name, "values.csv")
+        tokens = ["plain", "with, comma", 'with "quotes"', "4"]
+        SessionHelper.exportCsv(csvPath, tokens, header="token")
+        with open(csvPath, encoding="utf-8", newline="") as f:
+            self.assertEqual(list(csv.reader(f)), [["token"]] + [[token] for token in tokens])
+
+
+class IncrementalParserTest(unittest.TestCase):
+    def randomEdit(self, rng, text):
+        """Replace a random span with random characters, including delimiters and invalid ones."""
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 0, 1, 2, 5, 20]))
+        inserted = "".join(rng.choice("0123456789.,-,, x") for _ in range(rng.choice([0, 1, 1, 3, 8, 30])))
+        return text[:start] + inserted + text[end:], start + len(inserted)
+
+    def assertMatchesFreshParse(self, parser, text):
+        values = []
+        invalid = 0
+        for field in text.split(","):
+            try:
+                values.append(float(field))
+            except ValueError:
+                invalid += 1
+        self.assertEqual(parser.invalidCount(), invalid, text)
+        self.assertEqual(parser.isValid(), invalid == 0)
+        self.assertEqual(parser.dataset().values.tolist(), values, text)
+        summary = parser.summary()
+        self.assertEqual(summary["count"], len(values))
+        if values:
+            data = np.array(values)
+            self.assertEqual((summary["min"], summary["max"]), (data.min(), data.max()))
+            for name, expected in (("mean", data.mean()), ("populationStandardDeviation", data.std()),
+                                   ("sampleStandardDeviation", data.std(ddof=1) if len(data) > 1 else 0)):
+                self.assertAlmostEqual(summary[name], expected, delta=1e-9 * (1 + abs(data).max()), msg=name)
+
+    def test_random_edits_match_fresh_parse(self):
+        rng = random.Random(35)
+        for _ in range(20):
+            parser = IncrementalParser()
+            text = ",".join(repr(v) for v in randomData(rng, rng.randint(0, 30)))
+            parser.update(text)
+            for _ in range(100):
+                text, cursor = self.randomEdit(rng, text)
+                # the cursor is only a hint, so a missing or wrong one must give the same parse
+                parser.update(text, rng.choice([cursor, cursor, None, rng.randint(0, len(text))]))
+                self.assertMatchesFreshParse(parser, text)
+
+    def test_appends_and_large_removals_keep_the_variance(self):
+        parser = IncrementalParser()
+        text = "1e12"
+        parser.update(text)
+        for value in range(200):
+            text += f",{value}.5"
+            parser.update(text, len(text))
+        text = text[len("1e12,"):]  # the large value dominated the running sums
+        parser.update(text, 0)
+        self.assertMatchesFreshParse(parser, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# bootstrapHelp.py
+# Bootstrap resampling for confidence intervals around the statistics in statisticsHelp.py.
+# 10/19/2026
+# Resamples are drawn as index matrices with numpy and evaluated a block at a time, so a
+# whole block of resamples costs one vectorized call instead of one python loop per resample.
+# Large jobs are spread over worker processes.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _halfMedians(sortedRows, start, stop):
+    """Median of sortedRows[:, start:stop] for rows that are already sorted."""
+    length = stop - start
+    mid = start + length // 2
+    if length % 2 == 0:
+        return (sortedRows[:, mid - 1] + sortedRows[:, mid]) / 2
+    return sortedRows[:, mid]
+
+
+def _quartileRows(rows):
+    """Q1 and Q3 of every row, using the same halves as advancedStatisticsHelper.findQuartiles."""
+    n = rows.shape[1]
+    if n == 1:
+        return rows[:, 0], rows[:, 0]
+    half = n // 2
+    upperStart = half if n % 2 == 0 else half + 1
+    # only the ranks around the two half medians have to be in place, so partition instead of sort
+    kth = sorted({max(half // 2 - 1, 0), half // 2,
+                  upperStart + (n - upperStart) // 2 - 1, upperStart + (n - upperStart) // 2})
+    partitioned = np.partition(rows, kth, axis=1)
+    return _halfMedians(partitioned, 0, half), _halfMedians(partitioned, upperStart, n)
+
+
+def _meanRows(rows):
+    return rows.mean(axis=1)
+
+
+def _medianRows(rows):
+    return np.median(rows, axis=1)
+
+
+def _populationStdRows(rows):
+    return rows.std(axis=1)
+
+
+def _sampleStdRows(rows):
+    return rows.std(axis=1, ddof=1)
+
+
+def _rangeRows(rows):
+    return rows.max(axis=1) - rows.min(axis=1)
+
+
+def _iqrRows(rows):
+    q1, q3 = _quartileRows(rows)
+    return q3 - q1
+
+
+class BootstrapHelper:
+    """Percentile bootstrap confidence intervals for the library statistics."""
+
+    # statistic name -> function evaluating it on every row of a (resamples, n) matrix
+    statistics = {
+        "mean": _meanRows,
+        "median": _medianRows,
+        "populationStandardDeviation": _populationStdRows,
+        "sampleStandardDeviation": _sampleStdRows,
+        "range": _rangeRows,
+        "iqr": _iqrRows,
+    }
+    # statistics that are undefined below this many values (ddof=1 divides by n - 1)
+    minimumValues = {"sampleStandardDeviation": 2}
+
+    # upper bound on the number of values held in one index block (8 bytes each)
+    blockElements = 1 << 22
+    # resamples handed to a worker process at a time; also the unit of the seed stream
+    chunkResamples = 500
+    # below this many resampled values in total, a single process is faster than spawning workers
+    parallelThreshold = 1 << 24
+
+    @staticmethod
+    def _statisticFunction(statistic):
+        if callable(statistic):
+            return statistic
+        if statistic not in BootstrapHelper.statistics:
+            raise ValueError(
+                f"Unknown statistic '{statistic}'. Choose from: {', '.join(BootstrapHelper.statistics)}"
+            )
+        return BootstrapHelper.statistics[statistic]
+
+    @staticmethod
+    def _resampleChunk(data, statistic, count, seed, blockElements):
+        """Evaluate `count` resamples of data, drawing them in memory-bounded blocks."""
+        function = BootstrapHelper._statisticFunction(statistic)
+        rng = np.random.default_rng(seed)
+        n = len(data)
+        blockRows = max(1, blockElements // n)
+        # 32-bit indices halve the memory of a block and are quicker to draw
+        indexType = np.int32 if n < 2**31 else np.int64
+        results = np.empty(count, dtype=np.float64)
+        for start in range(0, count, blockRows):
+            rows = min(blockRows, count - start)
+            indices = rng.integers(0, n, size=(rows, n), dtype=indexType)
+            results[start:start + rows] = function(data[indices])
+        return results
+
+    @staticmethod
+    def bootstrapDistribution(data, statistic="mean", resamples=10000, seed=None, processes=None):
+        """
+        Return the statistic evaluated on `resamples` bootstrap resamples of data.
+        statistic is a name from BootstrapHelper.statistics, or a function taking a
+        (resamples, n) array and returning one value per row.
+        The result only depends on the seed, not on how many processes were used.
+        """
+        values = np.asarray(data, dtype=np.float64)
+        if values.ndim != 1 or len(values) == 0:
+            raise ValueError("Dataset must be a non-empty list of numbers.")
+        if resamples < 1:
+            raise ValueError("The number of resamples must be at least 1.")
+        BootstrapHelper._statisticFunction(statistic)
+        if isinstance(statistic, str) and len(values) < BootstrapHelper.minimumValues.get(statistic, 1):
+            raise ValueError(
+                f"'{statistic}' needs at least {BootstrapHelper.minimumValues[statistic]} values."
+            )
+
+        chunkSizes = [
+            min(BootstrapHelper.chunkResamples, resamples - start)
+            for start in range(0, resamples, BootstrapHelper.chunkResamples)
+        ]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunkSizes))
+
+        if processes is None:
+            large = resamples * len(values) >= BootstrapHelper.parallelThreshold
+            processes = (os.cpu_count() or 1) if large else 1
+        processes = min(processes, len(chunkSizes))
+        if processes <= 1 or not isinstance(statistic, str):
+            # custom functions are often lambdas, which cannot be sent to a worker process
+            chunks = [
+                BootstrapHelper._resampleChunk(values, statistic, size, chunkSeed,
+                                               BootstrapHelper.blockElements)
+                for size, chunkSeed in zip(chunkSizes, seeds)
+            ]
+        else:
+            # each worker gets its own block budget so all of them together stay within the limit
+            blockElements = max(1, BootstrapHelper.blockElements // processes)
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                chunks = list(pool.map(
+                    BootstrapHelper._resampleChunk,
+                    [values] * len(chunkSizes),
+                    [statistic] * len(chunkSizes),
+                    chunkSizes,
+                    seeds,
+                    [blockElements] * len(chunkSizes),
+                ))
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def confidenceInterval(data, statistic="mean", confidence=0.95, resamples=10000, seed=None, processes=None):
+        """
+        Calculate a percentile bootstrap confidence interval for a statistic of a dataset.
+        Returns (estimate, lower, upper), where estimate is the statistic of the full dataset.
+        """
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be between 0 and 1.")
+        distribution = BootstrapHelper.bootstrapDistribution(data, statistic, resamples, seed, processes)
+        function = BootstrapHelper._statisticFunction(statistic)
+        estimate = float(function(np.asarray(data, dtype=np.float64)[np.newaxis, :])[0])
+        alpha = (1 - confidence) / 2
+        lower, upper = np.quantile(distribution, [alpha, 1 - alpha])
+        return estimate, float(lower), float(upper)
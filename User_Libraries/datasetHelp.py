@@ -0,0 +1,417 @@
+# datasetHelp.py
+# Array-backed dataset and lazy pipeline for filter -> transform -> statistics chains.
+# 10/19/2026
+# A pipeline only records its operations. They run when statistics are requested, one chunk
+# at a time, so no intermediate list is built between the steps.
+import math
+
+import numpy as np
+
+
+class Dataset:
+    """A one-dimensional numeric dataset stored as a float64 numpy array."""
+
+    def __init__(self, values, sortedValues=None):
+        """Wrap a list, array or other sequence of numbers, optionally with its already sorted values."""
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        if self.values.ndim != 1:
+            raise ValueError("Dataset must be one-dimensional.")
+        self._sortedValues = sortedValues
+
+    @classmethod
+    def fromText(cls, text, delimiter=","):
+        """Build a dataset from a delimited string, like SimpleStatisticsHelper.datasetToList."""
+        if not text.strip():
+            return cls([])
+        return cls(np.array(text.split(delimiter), dtype=np.float64))
+
+    @staticmethod
+    def streamFile(path, chunkBytes=1 << 22):
+        """
+        Yield the numbers of a text file as float64 arrays, reading about chunkBytes at a time.
+        Values may be separated by commas, spaces or newlines.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            remainder = ""
+            while True:
+                block = f.read(chunkBytes)
+                if not block:
+                    break
+                text = (remainder + block).replace(",", " ")
+                # the last number may continue in the next block, so hold it back
+                cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"), text.rfind("\r"))
+                remainder = text[cut + 1:]
+                values = np.array(text[:cut + 1].split(), dtype=np.float64)
+                if len(values):
+                    yield values
+            values = np.array(remainder.split(), dtype=np.float64)
+            if len(values):
+                yield values
+
+    @classmethod
+    def fromFile(cls, path):
+        """Load every number of a text file into a dataset."""
+        chunks = list(cls.streamFile(path))
+        return cls(np.concatenate(chunks) if chunks else [])
+
+    def __len__(self):
+        return len(self.values)
+
+    def sortedValues(self):
+        """Return the sorted values, sorting only the first time they are needed."""
+        if self._sortedValues is None:
+            self._sortedValues = np.sort(self.values)
+        return self._sortedValues
+
+    def cachedSortedValues(self):
+        """Return the sorted values if they were already computed, otherwise None."""
+        return self._sortedValues
+
+    def quartiles(self):
+        """
+        Return (q1, q2, q3, q4, iqr, lowerBound, upperBound) computed like
+        advancedStatisticsHelper.findQuartiles, without building the outliers list.
+        """
+        if len(self.values) == 0:
+            return None, None, None, None, None, None, None
+        data = self.sortedValues()
+        n = len(data)
+        half = n // 2
+        q2 = _sortedMedian(data)
+        q1 = _sortedMedian(data[:half]) if half else data[0]
+        q3 = _sortedMedian(data[half if n % 2 == 0 else half + 1:]) if half else data[0]
+        q4 = data[-1]
+        iqr = q3 - q1
+        return (float(q1), float(q2), float(q3), float(q4), float(iqr),
+                float(q1 - 1.5 * iqr), float(q3 + 1.5 * iqr))
+
+    def pipe(self):
+        """Start a lazy pipeline over this dataset."""
+        return DatasetPipeline(self)
+
+
+def _sortedMedian(sortedData):
+    n = len(sortedData)
+    mid = n // 2
+    if n % 2 == 0:
+        return (sortedData[mid - 1] + sortedData[mid]) / 2
+    return sortedData[mid]
+
+
+class DatasetPipeline:
+    """
+    Lazy chain of operations over a Dataset.
+    Example:
+        Dataset(data).pipe().withinFences().map(lambda x: x / 100).stats("mean", "sampleStandardDeviation")
+    Functions given to filter and map receive a numpy array chunk, not single values.
+    """
+
+    # values processed per step of the fused pass
+    chunkSize = 1 << 16
+
+    # statistics that can be computed from running totals, without keeping the values
+    streamingStatistics = {"count", "sum", "mean", "min", "max", "range",
+                           "populationStandardDeviation", "sampleStandardDeviation"}
+    # statistics that need every kept value at the end of the pass
+    orderStatistics = {"median", "mode", "iqr"}
+
+    def __init__(self, dataset, operations=()):
+        self.dataset = dataset
+        self.operations = tuple(operations)
+
+    def filter(self, predicate):
+        """Keep the values for which predicate(chunk) returns True."""
+        return DatasetPipeline(self.dataset, self.operations + (("filter", predicate),))
+
+    def map(self, function):
+        """Replace every value by function(chunk)."""
+        return DatasetPipeline(self.dataset, self.operations + (("map", function),))
+
+    def withinFences(self):
+        """Drop the outliers found by the quartile fences of the source dataset."""
+        lowerBound, upperBound = self.dataset.quartiles()[5:7]
+        if lowerBound is None:
+            return self
+        return self.filter(lambda x: (x >= lowerBound) & (x <= upperBound))
+
+    def _chunks(self):
+        """Yield each chunk of the source after all recorded operations were applied."""
+        values = self.dataset.values
+        for start in range(0, len(values), self.chunkSize):
+            chunk = values[start:start + self.chunkSize]
+            for kind, function in self.operations:
+                if kind == "filter":
+                    chunk = chunk[np.asarray(function(chunk), dtype=bool)]
+                else:
+                    chunk = np.asarray(function(chunk), dtype=np.float64)
+                if len(chunk) == 0:
+                    break
+            if len(chunk):
+                yield chunk
+
+    def values(self):
+        """Run the pipeline and return the resulting values as one array."""
+        chunks = list(self._chunks())
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float64)
+
+    def stats(self, *names):
+        """
+        Run the pipeline once and return {name: value} for every requested statistic.
+        Names follow SimpleStatisticsHelper: mean, median, mode, range,
+        populationStandardDeviation, sampleStandardDeviation, plus count, sum, min, max and iqr.
+        """
+        unknown = [n for n in names if n not in self.streamingStatistics | self.orderStatistics]
+        if unknown:
+            raise ValueError(f"Unknown statistics: {', '.join(unknown)}")
+        keepValues = any(n in self.orderStatistics for n in names)
+
+        count, total, mean, m2 = 0, 0.0, 0.0, 0.0
+        low, high = math.inf, -math.inf
+        kept = []
+        for chunk in self._chunks():
+            # merge the chunk into the running mean and squared deviations (Chan et al.)
+            chunkCount = len(chunk)
+            chunkMean = chunk.mean()
+            chunkM2 = float(((chunk - chunkMean) ** 2).sum())
+            combined = count + chunkCount
+            delta = chunkMean - mean
+            mean += delta * chunkCount / combined
+            m2 += chunkM2 + delta * delta * count * chunkCount / combined
+            count = combined
+            total += float(chunk.sum())
+            low = min(low, float(chunk.min()))
+            high = max(high, float(chunk.max()))
+            if keepValues:
+                kept.append(chunk)
+
+        results = {}
+        for name in names:
+            if name == "count":
+                results[name] = count
+            elif count == 0:
+                # matches SimpleStatisticsHelper, which returns 0 (None for mode) on empty data
+                results[name] = None if name == "mode" else 0
+            elif name == "sum":
+                results[name] = total
+            elif name == "mean":
+                results[name] = float(mean)
+            elif name == "min":
+                results[name] = low
+            elif name == "max":
+                results[name] = high
+            elif name == "range":
+                results[name] = high - low
+            elif name == "populationStandardDeviation":
+                results[name] = math.sqrt(m2 / count)
+            elif name == "sampleStandardDeviation":
+                results[name] = math.sqrt(m2 / (count - 1)) if count > 1 else 0
+        if keepValues and count:
+            # without operations the values are the source's, and so is any sorted view it has
+            result = self.dataset if not self.operations else Dataset(np.concatenate(kept))
+            if "median" in names:
+                results["median"] = float(_sortedMedian(result.sortedValues()))
+            if "iqr" in names:
+                results["iqr"] = result.quartiles()[4]
+            if "mode" in names:
+                uniques, counts = np.unique(result.values, return_counts=True)
+                modes = uniques[counts == counts.max()].tolist()
+                if counts.max() == 1:
+                    results["mode"] = None
+                else:
+                    results["mode"] = modes if len(modes) > 1 else modes[0]
+        return {name: results[name] for name in names}
+
+
+def _matchLength(matches, limit, guess):
+    """
+    Largest k <= limit for which matches(k) holds, where matches is true up to some point and false after.
+    The search gallops out from guess, so a good guess needs only a couple of calls.
+    """
+    guess = min(max(guess, 0), limit)
+    if matches(guess):
+        low, step = guess, 1
+        while low + step <= limit and matches(low + step):
+            low += step
+            step *= 2
+        high = min(low + step - 1, limit)
+    else:
+        failed, step = guess, 1
+        while failed - step > 0 and not matches(failed - step):
+            failed -= step
+            step *= 2
+        low, high = max(failed - step, 0), failed - 1
+    while low < high:
+        mid = (low + high + 1) // 2
+        if matches(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+class IncrementalParser:
+    """
+    Keeps a delimited dataset string parsed while it is edited.
+    Each update only re-parses the fields touched by the edit and adjusts running sums,
+    so an edit costs time in proportion to its size and to the values after it.
+    """
+
+    def __init__(self, delimiter=","):
+        self.delimiter = delimiter
+        self.text = ""
+        self._starts = np.zeros(16, dtype=np.int64)  # offset of each field in text
+        self._values = np.zeros(16, dtype=np.float64)
+        self._valid = np.zeros(16, dtype=bool)
+        self._fields = 1  # "" is one empty field
+        self._invalid = 1
+        # sums are taken around a shift near the data, which keeps the variance accurate
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumSquares = 0.0
+        self._min, self._max = math.inf, -math.inf
+        self._extremesStale = False
+        # largest sum of squares held since the sums were last rebuilt; rounding error scales with it
+        self._peakSquares = 0.0
+        self._dataset = None
+
+    @staticmethod
+    def _parseFields(fields):
+        """Values and a valid mask for a list of field strings; a field that is not a number is invalid."""
+        try:
+            return np.array(fields, dtype=np.float64), np.ones(len(fields), dtype=bool)
+        except ValueError:
+            pass
+        values = np.zeros(len(fields), dtype=np.float64)
+        valid = np.zeros(len(fields), dtype=bool)
+        for i, field in enumerate(fields):
+            try:
+                values[i] = float(field)
+                valid[i] = True
+            except ValueError:
+                pass
+        return values, valid
+
+    def _reserve(self, size):
+        if size > len(self._values):
+            capacity = max(size, 2 * len(self._values))
+            for name in ("_starts", "_values", "_valid"):
+                old = getattr(self, name)
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:self._fields] = old[:self._fields]
+                setattr(self, name, grown)
+
+    def update(self, text, cursor=None):
+        """
+        Bring the parse up to date with text. cursor is where the edit ended in the new
+        text (for example QLineEdit.cursorPosition()); it only speeds up finding the edit.
+        """
+        old = self.text
+        if text == old:
+            return
+        delta = len(text) - len(old)
+        if cursor is None:
+            cursor = len(text)
+        # startswith/endswith compare without copying the new text; the old one is sliced once per call
+        prefix = _matchLength(lambda k: text.startswith(old[:k]),
+                              min(len(old), len(text)), cursor - max(delta, 0))
+        suffix = _matchLength(lambda k: text.endswith(old[len(old) - k:]),
+                              min(len(old), len(text)) - prefix, len(text) - cursor)
+        oldEnd = len(old) - suffix
+
+        # fields of the old text touched by the edit, including fields next to a changed delimiter
+        starts = self._starts[:self._fields]
+        first = int(np.searchsorted(starts, prefix, side="right")) - 1
+        last = int(np.searchsorted(starts, oldEnd, side="right")) - 1
+        regionStart = int(starts[first])
+        regionEnd = int(starts[last + 1]) - 1 if last + 1 < self._fields else len(old)
+
+        newFields = text[regionStart:regionEnd + delta].split(self.delimiter)
+        newValues, newValid = self._parseFields(newFields)
+        lengths = np.fromiter(map(len, newFields), dtype=np.int64, count=len(newFields))
+        newStarts = np.empty(len(newFields), dtype=np.int64)
+        newStarts[0] = regionStart
+        np.cumsum(lengths[:-1] + len(self.delimiter), out=newStarts[1:])
+        newStarts[1:] += regionStart
+
+        # take the replaced values out of the running totals
+        removed = self._values[first:last + 1][self._valid[first:last + 1]]
+        shifted = removed - self._shift
+        self._sum -= float(shifted.sum())
+        self._sumSquares -= float((shifted * shifted).sum())
+        self._invalid -= int((~self._valid[first:last + 1]).sum())
+        if len(removed) and (removed.min() <= self._min or removed.max() >= self._max):
+            self._extremesStale = True
+
+        # splice the new fields in; only the fields after the edit have to move
+        count = len(newFields)
+        tail = self._fields - (last + 1)
+        self._reserve(self._fields - (last + 1 - first) + count)
+        for name in ("_starts", "_values", "_valid"):
+            buffer = getattr(self, name)
+            buffer[first + count:first + count + tail] = buffer[last + 1:last + 1 + tail].copy()
+        self._fields = first + count + tail
+        self._starts[first:first + count] = newStarts
+        self._starts[first + count:self._fields] += delta
+        self._values[first:first + count] = newValues
+        self._valid[first:first + count] = newValid
+
+        added = newValues[newValid]
+        if self._fields - count - self._invalid == 0:
+            # nothing else is left, so the sums can start again around the new values
+            self._shift = float(added.mean()) if len(added) and np.isfinite(added).all() else 0.0
+            self._sum = self._sumSquares = self._peakSquares = 0.0
+        shifted = added - self._shift
+        self._sum += float(shifted.sum())
+        self._sumSquares += float((shifted * shifted).sum())
+        self._peakSquares = max(self._peakSquares, self._sumSquares)
+        self._invalid += int(count - newValid.sum())
+        if len(added) and not self._extremesStale:
+            self._min = min(self._min, float(added.min()))
+            self._max = max(self._max, float(added.max()))
+        self.text = text
+        self._dataset = None
+
+    def isValid(self):
+        """True when every field is a number, i.e. datasetToList would accept the text."""
+        return self._invalid == 0
+
+    def invalidCount(self):
+        return self._invalid
+
+    def dataset(self):
+        """The parsed values as a Dataset (built once per version of the text)."""
+        if self._dataset is None:
+            self._dataset = Dataset(self._values[:self._fields][self._valid[:self._fields]])
+        return self._dataset
+
+    def summary(self):
+        """Statistics kept up to date by every edit: count, sum, mean, min, max, range and both std devs."""
+        valid = self._valid[:self._fields]
+        count = int(self._fields - self._invalid)
+        if count == 0:
+            return {"count": 0, "sum": 0, "mean": 0, "min": 0, "max": 0, "range": 0,
+                    "populationStandardDeviation": 0, "sampleStandardDeviation": 0}
+        if self._extremesStale:
+            values = self._values[:self._fields][valid]
+            self._min, self._max = float(values.min()), float(values.max())
+            self._extremesStale = False
+        squares = self._sumSquares - self._sum * self._sum / count
+        if squares < 1e-6 * self._peakSquares or not math.isfinite(squares):
+            # too few digits survive (a large value was removed or the data moved); sum again around the mean
+            values = self._values[:self._fields][valid]
+            self._shift = float(values.mean()) if np.isfinite(values).all() else 0.0
+            shifted = values - self._shift
+            self._sum, self._sumSquares = float(shifted.sum()), float((shifted * shifted).sum())
+            self._peakSquares = self._sumSquares
+            squares = self._sumSquares - self._sum * self._sum / count
+        squares = max(squares, 0.0)
+        return {
+            "count": count,
+            "sum": self._sum + self._shift * count,
+            "mean": self._shift + self._sum / count,
+            "min": self._min,
+            "max": self._max,
+            "range": self._max - self._min,
+            "populationStandardDeviation": math.sqrt(squares / count),
+            "sampleStandardDeviation": math.sqrt(squares / (count - 1)) if count > 1 else 0,
+        }
@@ -0,0 +1,204 @@
+# outlierHelp.py
+# Out-of-core outlier detection for datasets stored in text files.
+# 10/19/2026
+# The first pass finds the quartile fences, either exactly from sorted runs spilled to disk or
+# approximately from a fixed-size random sample. The second pass streams the file again and
+# hands out the outliers with their positions, so memory never depends on the file size.
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from User_Libraries.datasetHelp import Dataset
+
+
+def _medianRanks(start, length):
+    """Sorted positions whose average is the median of a slice (start, start + length)."""
+    mid = start + length // 2
+    return (mid - 1, mid) if length % 2 == 0 else (mid,)
+
+
+def _quartileRanks(n):
+    """Sorted positions for Q1, Q2 and Q3, using the halves of advancedStatisticsHelper.findQuartiles."""
+    if n == 1:
+        return (0,), (0,), (0,)
+    half = n // 2
+    upperStart = half if n % 2 == 0 else half + 1
+    return _medianRanks(0, half), _medianRanks(0, n), _medianRanks(upperStart, n - upperStart)
+
+
+def _sortKey(value):
+    """Map a float to an integer with the same ordering, so the value space can be bisected."""
+    bits = int(np.float64(value).view(np.int64))
+    return bits if bits >= 0 else bits ^ 0x7FFFFFFFFFFFFFFF
+
+
+def _fromSortKey(key):
+    bits = key if key >= 0 else key ^ 0x7FFFFFFFFFFFFFFF
+    return float(np.int64(bits).view(np.float64))
+
+
+class OutOfCoreOutlierHelper:
+    """Two-pass outlier detection that keeps memory bounded for files of any size."""
+
+    # values per sorted run written to disk during an exact first pass
+    runValues = 1 << 22
+    # values kept by the sample of an approximate first pass
+    sketchSize = 1 << 16
+
+    @staticmethod
+    def _selectRank(runs, rank, low, high):
+        """Value at a sorted position across several sorted runs, found by bisecting the value range."""
+        lowKey, highKey = _sortKey(low), _sortKey(high)
+        while lowKey < highKey:
+            midKey = (lowKey + highKey) // 2
+            value = _fromSortKey(midKey)
+            atOrBelow = sum(int(np.searchsorted(run, value, side="right")) for run in runs)
+            if atOrBelow > rank:
+                highKey = midKey
+            else:
+                lowKey = midKey + 1
+        return _fromSortKey(lowKey)
+
+    @staticmethod
+    def _exactRanks(path, chunkBytes):
+        """Return (count, minimum, maximum, rank -> value function, cleanup function) using sorted runs on disk."""
+        runDirectory = tempfile.TemporaryDirectory(prefix="outliers-")
+        runPaths, buffered, bufferedCount = [], [], 0
+        count, low, high = 0, np.inf, -np.inf
+
+        def spill():
+            runPath = os.path.join(runDirectory.name, f"run{len(runPaths)}.npy")
+            np.save(runPath, np.sort(np.concatenate(buffered)))
+            runPaths.append(runPath)
+
+        for chunk in Dataset.streamFile(path, chunkBytes):
+            count += len(chunk)
+            low, high = min(low, chunk.min()), max(high, chunk.max())
+            buffered.append(chunk)
+            bufferedCount += len(chunk)
+            if bufferedCount >= OutOfCoreOutlierHelper.runValues:
+                spill()
+                buffered, bufferedCount = [], 0
+        if buffered:
+            spill()
+
+        runs = [np.load(runPath, mmap_mode="r") for runPath in runPaths]
+
+        def valueAt(rank):
+            return OutOfCoreOutlierHelper._selectRank(runs, rank, low, high)
+
+        def cleanup():
+            # the mappings have to be closed first; Windows cannot delete files that are still mapped
+            runs.clear()
+            runDirectory.cleanup()
+
+        return count, low, high, valueAt, cleanup
+
+    @staticmethod
+    def _approximateRanks(path, chunkBytes, seed):
+        """Return (count, minimum, maximum, rank -> value function, None) from a uniform random sample."""
+        rng = np.random.default_rng(seed)
+        size = OutOfCoreOutlierHelper.sketchSize
+        sample = np.empty(0, dtype=np.float64)
+        sampleKeys = np.empty(0, dtype=np.float64)
+        count, low, high = 0, np.inf, -np.inf
+        for chunk in Dataset.streamFile(path, chunkBytes):
+            count += len(chunk)
+            low, high = min(low, chunk.min()), max(high, chunk.max())
+            # keeping the values with the smallest random keys gives a uniform sample of fixed size
+            sample = np.concatenate([sample, chunk])
+            sampleKeys = np.concatenate([sampleKeys, rng.random(len(chunk))])
+            if len(sample) > size:
+                keep = np.argpartition(sampleKeys, size)[:size]
+                sample, sampleKeys = sample[keep], sampleKeys[keep]
+        sample.sort()
+
+        def valueAt(rank):
+            # scale the rank into the sample; exact when the whole file fit in the sample
+            return float(sample[round(rank * (len(sample) - 1) / max(count - 1, 1))])
+
+        return count, low, high, valueAt, None
+
+    @staticmethod
+    def findFences(path, method="exact", chunkBytes=1 << 22, seed=None):
+        """
+        First pass: calculate the quartiles and outlier fences of the numbers in a file.
+        method is "exact" (sorted runs spilled to disk) or "approximate" (random sample).
+        Returns a dict with count, q1, q2, q3, q4, iqr, lowerBound, upperBound, seconds.
+        """
+        start = time.perf_counter()
+        if method == "exact":
+            count, low, high, valueAt, cleanup = OutOfCoreOutlierHelper._exactRanks(path, chunkBytes)
+        elif method == "approximate":
+            count, low, high, valueAt, cleanup = OutOfCoreOutlierHelper._approximateRanks(
+                path, chunkBytes, seed
+            )
+        else:
+            raise ValueError("method must be 'exact' or 'approximate'.")
+        try:
+            if count == 0:
+                raise ValueError("The file does not contain any numbers.")
+            q1, q2, q3 = (
+                sum(valueAt(rank) for rank in ranks) / len(ranks) for ranks in _quartileRanks(count)
+            )
+        finally:
+            if cleanup is not None:
+                cleanup()
+        iqr = q3 - q1
+        return {
+            "count": count,
+            "q1": q1,
+            "q2": q2,
+            "q3": q3,
+            "q4": float(high),
+            "iqr": iqr,
+            "lowerBound": q1 - 1.5 * iqr,
+            "upperBound": q3 + 1.5 * iqr,
+            "seconds": time.perf_counter() - start,
+        }
+
+    @staticmethod
+    def _outlierChunks(path, lowerBound, upperBound, chunkBytes):
+        """Yield (positions, values) arrays of the outliers found in each chunk of the file."""
+        offset = 0
+        for chunk in Dataset.streamFile(path, chunkBytes):
+            positions = np.flatnonzero((chunk < lowerBound) | (chunk > upperBound))
+            if len(positions):
+                yield positions + offset, chunk[positions]
+            offset += len(chunk)
+
+    @staticmethod
+    def iterOutliers(path, lowerBound, upperBound, chunkBytes=1 << 22):
+        """Second pass: yield (position, value) for every value outside the fences."""
+        for positions, values in OutOfCoreOutlierHelper._outlierChunks(path, lowerBound, upperBound, chunkBytes):
+            yield from zip(positions.tolist(), values.tolist())
+
+    @staticmethod
+    def findOutliers(path, outputPath, method="exact", chunkBytes=1 << 22, seed=None):
+        """
+        Run both passes over a file and write its outliers to outputPath as "position,value" lines.
+        Returns the fences from findFences plus outlierCount and throughput of each pass.
+        """
+        report = OutOfCoreOutlierHelper.findFences(path, method, chunkBytes, seed)
+        start = time.perf_counter()
+        outlierCount = 0
+        with open(outputPath, "w", encoding="utf-8") as output:
+            output.write("position,value\n")
+            for positions, values in OutOfCoreOutlierHelper._outlierChunks(
+                path, report["lowerBound"], report["upperBound"], chunkBytes
+            ):
+                outlierCount += len(positions)
+                output.write("".join(f"{p},{v}\n" for p, v in zip(positions.tolist(), values.tolist())))
+        outlierSeconds = time.perf_counter() - start
+
+        megabytes = os.path.getsize(path) / (1 << 20)
+        report["outlierCount"] = outlierCount
+        report["outlierSeconds"] = outlierSeconds
+        report["fenceValuesPerSecond"] = report["count"] / report["seconds"] if report["seconds"] else None
+        report["outlierValuesPerSecond"] = report["count"] / outlierSeconds if outlierSeconds else None
+        report["megabytesPerSecond"] = (
+            2 * megabytes / (report["seconds"] + outlierSeconds) if report["seconds"] + outlierSeconds else None
+        )
+        return report
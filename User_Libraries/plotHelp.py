@@ -0,0 +1,155 @@
+# plotHelp.py
+# Incremental summaries used to plot very large datasets.
+# 10/19/2026
+# Plots are drawn from fixed-size summaries instead of the raw points: binned counts for the
+# histogram and per-bucket min/max for the index view. Both can take appended values and
+# coarsen themselves by merging neighbours, so their size never depends on the dataset size.
+import math
+
+import numpy as np
+
+
+class IncrementalHistogram:
+    """Histogram on bins aligned to multiples of the bin width, so bins can be merged exactly."""
+
+    def __init__(self, maxBins=512):
+        self.maxBins = maxBins
+        self.width = None
+        self.offset = 0  # index of the first bin, in units of width
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def _mergePairs(self):
+        """Double the bin width by adding neighbouring bins together."""
+        indices = np.arange(self.offset, self.offset + len(self.counts)) // 2
+        newOffset = self.offset // 2
+        self.counts = np.bincount(indices - newOffset, weights=self.counts).astype(np.int64)
+        self.offset = newOffset
+        self.width *= 2
+
+    def append(self, values):
+        """Add values to the histogram."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.width is None:
+            # a power of two width keeps the bins aligned when they are merged later
+            spread = high - low
+            self.width = 2.0 ** math.ceil(math.log2(spread / self.maxBins)) if spread > 0 else 1.0
+            self.offset = math.floor(low / self.width)
+        first = min(self.offset, math.floor(low / self.width))
+        last = max(self.offset + len(self.counts) - 1, math.floor(high / self.width))
+        while last - first + 1 > self.maxBins:
+            self._mergePairs()
+            first = min(self.offset, math.floor(low / self.width))
+            last = max(self.offset + len(self.counts) - 1, math.floor(high / self.width))
+        # grow the counts to cover the new values, then add them in one bincount
+        counts = np.zeros(last - first + 1, dtype=np.int64)
+        counts[self.offset - first:self.offset - first + len(self.counts)] = self.counts
+        indices = np.floor(values / self.width).astype(np.int64) - first
+        counts += np.bincount(indices, minlength=len(counts))
+        self.counts, self.offset = counts, first
+
+    def edges(self):
+        """Bin edges, one more than the number of counts."""
+        if self.width is None:
+            return np.zeros(1)
+        return (self.offset + np.arange(len(self.counts) + 1)) * self.width
+
+
+class IncrementalMinMax:
+    """Min and max of consecutive buckets of a series, for drawing it against its index."""
+
+    def __init__(self, maxBuckets=4096):
+        self.maxBuckets = maxBuckets
+        self.bucketSize = 1
+        self.mins = np.zeros(0)
+        self.maxs = np.zeros(0)
+        # the last bucket, still filling up
+        self.partialMin, self.partialMax, self.partialCount = math.inf, -math.inf, 0
+        self.count = 0
+
+    def _mergePairs(self):
+        """Double the bucket size; an odd last bucket joins the partial one."""
+        if len(self.mins) % 2:
+            self.partialMin = min(self.partialMin, self.mins[-1])
+            self.partialMax = max(self.partialMax, self.maxs[-1])
+            self.partialCount += self.bucketSize
+            self.mins, self.maxs = self.mins[:-1], self.maxs[:-1]
+        self.mins = self.mins.reshape(-1, 2).min(axis=1)
+        self.maxs = self.maxs.reshape(-1, 2).max(axis=1)
+        self.bucketSize *= 2
+
+    def append(self, values):
+        """Add values to the end of the series."""
+        values = np.asarray(values, dtype=np.float64)
+        self.count += len(values)
+        while len(values):
+            if self.partialCount or len(values) < self.bucketSize:
+                # top up the partial bucket first
+                take = min(self.bucketSize - self.partialCount, len(values))
+                self.partialMin = min(self.partialMin, float(values[:take].min()))
+                self.partialMax = max(self.partialMax, float(values[:take].max()))
+                self.partialCount += take
+                values = values[take:]
+                if self.partialCount == self.bucketSize:
+                    self.mins = np.append(self.mins, self.partialMin)
+                    self.maxs = np.append(self.maxs, self.partialMax)
+                    self.partialMin, self.partialMax, self.partialCount = math.inf, -math.inf, 0
+            else:
+                full = len(values) // self.bucketSize * self.bucketSize
+                blocks = values[:full].reshape(-1, self.bucketSize)
+                self.mins = np.concatenate([self.mins, blocks.min(axis=1)])
+                self.maxs = np.concatenate([self.maxs, blocks.max(axis=1)])
+                values = values[full:]
+            while len(self.mins) > self.maxBuckets:
+                self._mergePairs()
+                # a larger bucket size may make the partial bucket complete
+                if self.partialCount >= self.bucketSize:
+                    self.mins = np.append(self.mins, self.partialMin)
+                    self.maxs = np.append(self.maxs, self.partialMax)
+                    self.partialMin, self.partialMax, self.partialCount = math.inf, -math.inf, 0
+
+    def curve(self):
+        """(x, y) arrays alternating each bucket's min and max, ready to draw as one line."""
+        mins, maxs = self.mins, self.maxs
+        if self.partialCount:
+            mins, maxs = np.append(mins, self.partialMin), np.append(maxs, self.partialMax)
+        x = np.repeat(np.arange(len(mins)) * self.bucketSize + (self.bucketSize - 1) / 2, 2)
+        y = np.empty(2 * len(mins))
+        y[0::2], y[1::2] = mins, maxs
+        return x, y
+
+
+def boxPlotSegments(values, q1, q2, q3, lowerBound, upperBound, position=0.0, width=0.6):
+    """
+    Line segments (x, y) of a box plot, using the quartiles and fences from
+    advancedStatisticsHelper.findQuartiles. Whiskers end at the most extreme values inside the fences.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    inside = values[(values >= lowerBound) & (values <= upperBound)]
+    low, high = (float(inside.min()), float(inside.max())) if len(inside) else (q1, q3)
+    left, right = position - width / 2, position + width / 2
+    segments = [
+        (left, q1, right, q1), (right, q1, right, q3), (right, q3, left, q3), (left, q3, left, q1),
+        (left, q2, right, q2),
+        (position, q1, position, low), (position, q3, position, high),
+        (position - width / 4, low, position + width / 4, low),
+        (position - width / 4, high, position + width / 4, high),
+    ]
+    x = np.array([[s[0], s[2]] for s in segments]).ravel()
+    y = np.array([[s[1], s[3]] for s in segments]).ravel()
+    return x, y
+
+
+def thinPoints(values, maxPoints=5000):
+    """At most maxPoints of values, keeping the extremes, for scatter plots of outliers."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= maxPoints:
+        return values
+    values = np.unique(values)
+    if len(values) <= maxPoints:
+        return values
+    keep = np.linspace(0, len(values) - 1, maxPoints).round().astype(np.int64)
+    return values[keep]
@@ -0,0 +1,152 @@
+# sessionHelp.py
+# Binary session snapshots and streaming export of large results.
+# 10/19/2026
+# A snapshot stores the dataset and its sorted view as raw little-endian float64 arrays,
+# followed by a JSON footer with the statistics, tokenizer settings and array offsets.
+# Loading maps the arrays from the file instead of reading them, so it takes the same time
+# for any dataset size.
+import csv
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from User_Libraries.datasetHelp import Dataset
+
+
+MAGIC = b"STATSNAP"
+SNAPSHOT_VERSION = 1
+# magic, version, footer offset, footer length
+HEADER = struct.Struct("<8sIQQ")
+# arrays start on 64 byte boundaries so they can be mapped and read efficiently
+ALIGNMENT = 64
+
+
+class SessionHelper:
+    """Save and load session snapshots, and export values without building one large string."""
+
+    # values converted to text at a time when exporting
+    exportChunk = 1 << 16
+
+    @staticmethod
+    def saveSnapshot(path, dataset, statistics=None, tokenizer=None, output=""):
+        """
+        Write a snapshot of a session.
+        dataset is a Dataset (or list of numbers); its sorted view is stored if it was computed.
+        statistics and tokenizer are JSON compatible dicts, output is the text of the output box.
+        """
+        if not isinstance(dataset, Dataset):
+            dataset = Dataset(dataset)
+        arrays = {"values": dataset.values}
+        if dataset.cachedSortedValues() is not None:
+            arrays["sortedValues"] = dataset.cachedSortedValues()
+
+        # write next to the target and rename, so a failed save never leaves half a snapshot behind.
+        # Windows cannot replace a file that is still mapped; see isMappedFrom.
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                SessionHelper._writeSnapshot(f, arrays, statistics, tokenizer, output)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    @staticmethod
+    def _writeSnapshot(f, arrays, statistics, tokenizer, output):
+        """Write the header, aligned arrays and JSON footer of a snapshot to an open file."""
+        f.write(b"\0" * HEADER.size)
+        layout = {}
+        for name, values in arrays.items():
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            layout[name] = {"offset": f.tell(), "count": len(values)}
+            # written straight from the array's memory, without a bytes copy
+            f.write(memoryview(np.ascontiguousarray(values, dtype="<f8")).cast("B"))
+        footer = json.dumps({
+            "arrays": layout,
+            "statistics": statistics or {},
+            "tokenizer": tokenizer or {},
+            "output": output,
+        }).encode("utf-8")
+        footerOffset = f.tell()
+        f.write(footer)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION, footerOffset, len(footer)))
+
+    @staticmethod
+    def isMappedFrom(dataset, path):
+        """True if the arrays of dataset are memory mapped from the file at path (as after loadSnapshot)."""
+        if not os.path.exists(path):
+            return False
+        for array in (dataset.values, dataset.cachedSortedValues()):
+            while array is not None:
+                if isinstance(array, np.memmap) and array.filename and os.path.samefile(array.filename, path):
+                    return True
+                array = getattr(array, "base", None)
+        return False
+
+    @staticmethod
+    def loadSnapshot(path):
+        """
+        Open a snapshot. The dataset arrays are memory mapped read-only from the file.
+        Returns a dict with dataset, statistics, tokenizer and output.
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError("Not a session snapshot.")
+            magic, version, footerOffset, footerLength = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("Not a session snapshot.")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}.")
+            f.seek(footerOffset)
+            footer = json.loads(f.read(footerLength).decode("utf-8"))
+
+        arrays = {}
+        for name, entry in footer["arrays"].items():
+            if entry["count"] == 0:
+                arrays[name] = np.empty(0, dtype=np.float64)
+            else:
+                arrays[name] = np.memmap(path, dtype="<f8", mode="r",
+                                         offset=entry["offset"], shape=(entry["count"],))
+        dataset = Dataset(arrays["values"], arrays.get("sortedValues"))
+        return {
+            "dataset": dataset,
+            "statistics": footer["statistics"],
+            "tokenizer": footer["tokenizer"],
+            "output": footer["output"],
+        }
+
+    @staticmethod
+    def _chunks(values):
+        """Values as python numbers (or the strings of tokenized text), a chunk at a time."""
+        for start in range(0, len(values), SessionHelper.exportChunk):
+            chunk = values[start:start + SessionHelper.exportChunk]
+            yield chunk.tolist() if hasattr(chunk, "tolist") else chunk
+
+    @staticmethod
+    def exportCsv(path, values, header="value"):
+        """Write values to a CSV file, one per row, a chunk at a time."""
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if header:
+                writer.writerow([header])
+            for chunk in SessionHelper._chunks(values):
+                writer.writerows([value] for value in chunk)
+
+    @staticmethod
+    def exportJson(path, values, statistics=None):
+        """
+        Write {"statistics": ..., "values": [...]} to a JSON file, streaming the values in chunks.
+        NaN and infinity have no JSON form and raise ValueError.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"statistics": ' + json.dumps(statistics or {}, allow_nan=False) + ', "values": [')
+            first = True
+            for chunk in SessionHelper._chunks(values):
+                f.write(("" if first else ", ") + ", ".join(json.dumps(v, allow_nan=False) for v in chunk))
+                first = False
+            f.write("]}\n")
@@ -6,9 +6,19 @@
 # It also containes a Tokenizer powered by bert AI. It is run locally
 import math
 
+import numpy as np
+
 
 from transformers import AutoTokenizer
+import transformers
+
+from User_Libraries.tokenCache import TokenCache
+from User_Libraries.datasetHelp import Dataset
 
+TOKENIZER_NAME = "bert-base-uncased"
+# the transformers version is part of the identity, since an upgrade can change the tokens
+TOKENIZER_ID = f"{TOKENIZER_NAME}@transformers-{transformers.__version__}"
+tokenCache = TokenCache()
 
 
 class SimpleStatisticsHelper:
@@ -17,19 +27,78 @@ class SimpleStatisticsHelper:
         pass
 
 
+    # the pre-trained tokenizer, loaded on first use and kept warm afterwards
+    _tokenizer = None
+
     #staticmethods are used for efficiency and to avoid the need for instantiation.
     @staticmethod
-    def tokenize(data, alphaOrNum=3):
+    def getTokenizer():
+        """Load the pre-trained tokenizer once and reuse it for every later call."""
+        if SimpleStatisticsHelper._tokenizer is None:
+            SimpleStatisticsHelper._tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_NAME)
+        return SimpleStatisticsHelper._tokenizer
+
+    @staticmethod
+    def tokenize(data, alphaOrNum=3, useCache=True):
         """
         Tokenize a string using a pre-trained tokenizer.
         A user may input data of any type and have it tokenized to save time and energy.
+        Results for strings are kept in an on-disk cache, so repeating a paste skips the tokenizer.
         """
-        tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
-        if isinstance(data, str):
-            components = data.split()  # clean up the string by splitting on whitespace
-        else:
-            components = list(data)
-        dirtyTokens = [tokenizer.tokenize(component) for component in components]
+        return SimpleStatisticsHelper.tokenizeBatch([data], alphaOrNum, useCache)[0]
+
+    @staticmethod
+    def tokenizeBatch(dataList, alphaOrNum=3, useCache=True):
+        """
+        Tokenize several inputs at once. The inputs that are not cached go through the
+        tokenizer in a single batch call, then are split back into one token list per input.
+        """
+        results = [None] * len(dataList)
+        pending = []
+        for index, data in enumerate(dataList):
+            if useCache and isinstance(data, str):
+                cached = tokenCache.get(data, TOKENIZER_ID, alphaOrNum)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.append(index)
+        if not pending:
+            return results
+
+        tokenizer = SimpleStatisticsHelper.getTokenizer()
+        componentLists = []
+        for index in pending:
+            data = dataList[index]
+            if isinstance(data, str):
+                componentLists.append(data.split())  # clean up the string by splitting on whitespace
+            else:
+                componentLists.append(list(data))
+        dirtyTokens = SimpleStatisticsHelper._tokenizeComponents(
+            tokenizer, [component for components in componentLists for component in components]
+        )
+        position = 0
+        for index, components in zip(pending, componentLists):
+            tokens = SimpleStatisticsHelper._cleanTokens(
+                dirtyTokens[position:position + len(components)], alphaOrNum
+            )
+            position += len(components)
+            if useCache and isinstance(dataList[index], str):
+                tokenCache.put(dataList[index], TOKENIZER_ID, alphaOrNum, tokens)
+            results[index] = tokens
+        return results
+
+    @staticmethod
+    def _tokenizeComponents(tokenizer, components):
+        """Tokenize every component; fast tokenizers handle the whole list in one call."""
+        if getattr(tokenizer, "is_fast", False) and components:
+            # same tokens as tokenizer.tokenize(component), which encodes without special tokens
+            encodings = tokenizer(components, add_special_tokens=False)
+            return [encodings.tokens(i) for i in range(len(components))]
+        return [tokenizer.tokenize(component) for component in components]
+
+    @staticmethod
+    def _cleanTokens(dirtyTokens, alphaOrNum):
+        """Merge the word pieces of each component and keep the requested kind of tokens."""
         tokens = []
         # Flatten the list and filter out empty tokens, include single tokens and clean up larger tokens
         for token in dirtyTokens:
@@ -55,9 +124,21 @@ class SimpleStatisticsHelper:
             tokens = [float(token) for token in tokens if token.lstrip('-').isdigit()]
         return tokens
 
+    @staticmethod
+    def _arrayStatistic(name, data):
+        """
+        Statistics of numpy arrays (such as a loaded session) are computed by numpy in one pass.
+        A Dataset is used as it is, so a sorted view it already has is not computed again.
+        """
+        if not isinstance(data, Dataset):
+            data = Dataset(data)
+        return data.pipe().stats(name)[name]
+
     @staticmethod
     def mean(data):
         """Calculate the mean of a list of numbers."""
+        if isinstance(data, (np.ndarray, Dataset)):
+            return SimpleStatisticsHelper._arrayStatistic("mean", data)
         if not data:
             return 0
         return sum(data) / len(data)
@@ -66,6 +147,8 @@ class SimpleStatisticsHelper:
     @staticmethod
     def median(data):
         """Calculate the median of a list of numbers."""
+        if isinstance(data, (np.ndarray, Dataset)):
+            return SimpleStatisticsHelper._arrayStatistic("median", data)
         if not data:
             return 0
         sorted_data = sorted(data)
@@ -79,6 +162,8 @@ class SimpleStatisticsHelper:
     @staticmethod
     def populationStandardDeviation(data):
         """Calculate the standard deviation of a list of numbers with population."""
+        if isinstance(data, (np.ndarray, Dataset)):
+            return SimpleStatisticsHelper._arrayStatistic("populationStandardDeviation", data)
         if not data:
             return 0
         meanValue = SimpleStatisticsHelper.mean(data)
@@ -88,6 +173,8 @@ class SimpleStatisticsHelper:
     @staticmethod
     def sampleStandardDeviation(data):
         """Calculate the standard deviation of a list of numbers with sample."""
+        if isinstance(data, (np.ndarray, Dataset)):
+            return SimpleStatisticsHelper._arrayStatistic("sampleStandardDeviation", data)
         if not data:
             return 0
         meanValue = SimpleStatisticsHelper.mean(data)
@@ -97,6 +184,8 @@ class SimpleStatisticsHelper:
     @staticmethod
     def range(data):
         """Calculate the range of a list of numbers."""
+        if isinstance(data, (np.ndarray, Dataset)):
+            return SimpleStatisticsHelper._arrayStatistic("range", data)
         if not data:
             return 0
         return max(data) - min(data)
@@ -104,6 +193,8 @@ class SimpleStatisticsHelper:
     @staticmethod
     def mode(data):
         """Calculate the mode of a list of numbers."""
+        if isinstance(data, (np.ndarray, Dataset)):
+            return SimpleStatisticsHelper._arrayStatistic("mode", data)
         if not data:
             return None
         frequency = {}
@@ -164,12 +255,17 @@ class advancedStatisticsHelper:
 
     def findQuartiles(self, dataset):
         """Calculate the first, second, third, and fourth quartiles of a dataset."""
+        if isinstance(dataset, (np.ndarray, Dataset)):
+            return self._findQuartilesArray(dataset)
         if not dataset:
             return None, None
         sorted_data = sorted(dataset)
         n = len(sorted_data)
         q2 = SimpleStatisticsHelper.median(sorted_data)
-        if n % 2 == 0:
+        if n == 1:
+            # both halves would be empty; a single value is its own Q1 and Q3
+            lower_half = upper_half = sorted_data
+        elif n % 2 == 0:
             lower_half = sorted_data[: n // 2]
             upper_half = sorted_data[n // 2 :]
         else:
@@ -190,10 +286,29 @@ class advancedStatisticsHelper:
         self.lowerBound, self.upperBound, self.outliers = lower_bound, upper_bound, outliers
         
         return q1, q2, q3, q4, iqr, lower_bound, upper_bound, outliers
+
+    def _findQuartilesArray(self, dataset):
+        """findQuartiles for numpy arrays and Datasets, sorted by numpy instead of as a python list."""
+        if len(dataset) == 0:
+            return None, None
+        if not isinstance(dataset, Dataset):
+            dataset = Dataset(dataset)
+        q1, q2, q3, q4, iqr, lower_bound, upper_bound = dataset.quartiles()
+        # the outliers are the two ends of the sorted view
+        sorted_data = dataset.sortedValues()
+        outliers = np.concatenate([
+            sorted_data[:np.searchsorted(sorted_data, lower_bound, side="left")],
+            sorted_data[np.searchsorted(sorted_data, upper_bound, side="right"):],
+        ]).tolist()
+
+        self.q1, self.q2, self.q3, self.q4, self.iqr = q1, q2, q3, q4, iqr
+        self.lowerBound, self.upperBound, self.outliers = lower_bound, upper_bound, outliers
+
+        return q1, q2, q3, q4, iqr, lower_bound, upper_bound, outliers
     
     def zScore(self, data, value):
         """Calculate the z-score of a value in a dataset."""
-        if not data:
+        if len(data) == 0:
             return None
         if self.savedMean is None:
             mean_value = SimpleStatisticsHelper.mean(data)
@@ -232,7 +347,7 @@ class advancedStatisticsHelper:
     @staticmethod 
     def frequencyDistribution(data, lowest_class_limit, class_width):
         """Print a formatted frequency distribution table (supports int and float data)."""
-        if not data:
+        if len(data) == 0:
             print("No data provided.")
             return
 
@@ -0,0 +1,351 @@
+# statsService.py
+# Local asyncio HTTP/JSON service exposing the statistics engine and the tokenizer without the GUI.
+# 10/19/2026
+# Tokenize requests that arrive while the tokenizer is busy are queued and served together by one
+# tokenizeBatch call. Statistics run in a thread pool, or in worker processes for large datasets,
+# so the event loop only parses requests and writes responses.
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from User_Libraries.statisticsHelp import SimpleStatisticsHelper, advancedStatisticsHelper
+from User_Libraries.datasetHelp import Dataset
+
+
+SIMPLE_OPERATIONS = [
+    "mean", "median", "mode", "range", "populationStandardDeviation", "sampleStandardDeviation",
+]
+ADVANCED_OPERATIONS = ["findQuartiles", "zScore", "frequencyDistribution"]
+QUARTILE_NAMES = ["q1", "q2", "q3", "q4", "iqr", "lowerBound", "upperBound", "outliers"]
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _jsonValue(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_jsonValue(v) for v in value]
+    return value
+
+
+def _textKey(text, delimiter):
+    # the delimiter is part of the key: the same text splits differently under another one
+    digest = hashlib.sha256(f"{len(delimiter)}:{delimiter}:".encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _valuesKey(values):
+    return hashlib.sha256(values.tobytes()).hexdigest()
+
+
+def decodeRequest(raw):
+    """
+    Decode a JSON request body and convert a "data" list to a float64 array.
+    Top level so large bodies can be decoded in a worker process: json and numpy hold the GIL
+    while converting, so a thread would still stall the event loop.
+    """
+    body = json.loads(raw)
+    if isinstance(body, dict) and isinstance(body.get("data"), list):
+        try:
+            body["data"] = Dataset(body["data"]).values
+        except (TypeError, ValueError):
+            pass  # left as a list; _dataset reports it
+    return body
+
+
+def runOperation(operation, values, params):
+    """Run one library operation on a dataset. Top level so worker processes can unpickle it."""
+    if operation in SIMPLE_OPERATIONS:
+        return _jsonValue(getattr(SimpleStatisticsHelper, operation)(values))
+    if operation == "findQuartiles":
+        result = advancedStatisticsHelper().findQuartiles(values)
+        if len(result) != len(QUARTILE_NAMES):
+            return None
+        return {name: _jsonValue(value) for name, value in zip(QUARTILE_NAMES, result)}
+    if operation == "zScore":
+        return _jsonValue(advancedStatisticsHelper().zScore(values, float(params["value"])))
+    if operation == "frequencyDistribution":
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            advancedStatisticsHelper.frequencyDistribution(
+                values, float(params.get("lowestClassLimit", 0)), float(params.get("classWidth", 5))
+            )
+        return buf.getvalue()
+    raise KeyError(operation)
+
+
+def runOperationResponse(operation, values, params):
+    """runOperation with its {"result": ...} response already encoded, so long results are encoded by the worker."""
+    return json.dumps({"result": runOperation(operation, values, params)}).encode("utf-8")
+
+
+class RequestError(Exception):
+    """An error reported to the client with an HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class TokenizeBatcher:
+    """Collects concurrent tokenize requests and serves each group with one tokenizeBatch call."""
+
+    def __init__(self, executor, window=0.005, maxBatch=64):
+        self.executor = executor
+        self.window = window
+        self.maxBatch = maxBatch
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.requests = 0
+
+    async def tokenize(self, text, alphaOrNum):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, alphaOrNum, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # wait a moment for more callers; anything queued while the tokenizer ran is taken at once
+            deadline = loop.time() + self.window
+            while len(batch) < self.maxBatch:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[1], []).append(item)
+            for alphaOrNum, items in groups.items():
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor, SimpleStatisticsHelper.tokenizeBatch,
+                        [text for text, _, _ in items], alphaOrNum,
+                    )
+                except Exception as e:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                self.batches += 1
+                self.requests += len(items)
+                for (_, _, future), tokens in zip(items, results):
+                    if not future.done():
+                        future.set_result(tokens)
+
+
+class StatisticsService:
+    """HTTP/JSON front end for the statistics library."""
+
+    # request bodies larger than this are refused
+    maxBodyBytes = 256 * 1024 * 1024
+    # datasets with at least this many values are computed in a worker process
+    processThreshold = 200_000
+    # request bodies and dataset texts longer than this are decoded in a worker process, and larger
+    # datasets are hashed in a thread, so the event loop keeps serving other clients meanwhile
+    offloadSize = 1 << 16
+
+    def __init__(self, workers=None, cacheSize=32):
+        self.workers = workers or os.cpu_count() or 1
+        self.cacheSize = cacheSize
+        self.datasets = OrderedDict()
+        self.tokenizerReady = False
+        self.tokenizerError = None
+        self.threadPool = None
+        self.processPool = None
+        self.batcher = None
+
+    async def start(self, host="127.0.0.1", port=8765, unixPath=None):
+        """Start the pools, warm the tokenizer in the background and begin serving."""
+        self.threadPool = ThreadPoolExecutor(max_workers=self.workers)
+        # workers start from a fresh interpreter instead of forking a process that holds the tokenizer
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.processPool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        # one thread owns the tokenizer; a fast tokenizer must not be used from two threads at once
+        tokenizerThread = ThreadPoolExecutor(max_workers=1)
+        self.batcher = TokenizeBatcher(tokenizerThread)
+        self._tasks = [
+            asyncio.create_task(self.batcher.run()),
+            asyncio.create_task(self._warmTokenizer(tokenizerThread)),
+        ]
+        if unixPath:
+            self.server = await asyncio.start_unix_server(self._handleConnection, path=unixPath)
+        else:
+            self.server = await asyncio.start_server(self._handleConnection, host, port)
+        return self.server
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        self.threadPool.shutdown(wait=False, cancel_futures=True)
+        self.processPool.shutdown(wait=False, cancel_futures=True)
+        self.batcher.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _warmTokenizer(self, executor):
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, SimpleStatisticsHelper.getTokenizer)
+            self.tokenizerReady = True
+        except Exception as e:
+            # statistics keep working without the tokenizer; tokenize requests will report this
+            self.tokenizerError = str(e)
+
+    def _cacheDataset(self, key, dataset):
+        self.datasets[key] = dataset
+        self.datasets.move_to_end(key)
+        while len(self.datasets) > self.cacheSize:
+            self.datasets.popitem(last=False)
+
+    async def _run(self, executor, size, function, *args):
+        """Call function inline when its input is small, otherwise in executor."""
+        if size < self.offloadSize:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+    async def _dataset(self, body):
+        """The dataset of a request: a cached datasetId, a "dataset" string or a "data" list."""
+        if "datasetId" in body:
+            dataset = self.datasets.get(body["datasetId"])
+            if dataset is None:
+                raise RequestError(404, "Unknown datasetId; post the dataset to /datasets again.")
+            self.datasets.move_to_end(body["datasetId"])
+            return dataset
+        if isinstance(body.get("dataset"), str):
+            # parsed datasets are cached by the hash of their text and delimiter, so repeats skip the parse
+            text, delimiter = body["dataset"], body.get("delimiter", ",")
+            if not isinstance(delimiter, str):
+                raise RequestError(400, '"delimiter" must be a string.')
+            # hashlib releases the GIL, so a thread is enough for the hash
+            key = await self._run(self.threadPool, len(text), _textKey, text, delimiter)
+            if key not in self.datasets:
+                try:
+                    dataset = await self._run(
+                        self.processPool, len(text), Dataset.fromText, text, delimiter
+                    )
+                except ValueError as e:
+                    raise RequestError(400, f"Invalid dataset: {e}")
+                self._cacheDataset(key, dataset)
+            return await self._dataset({"datasetId": key})
+        if isinstance(body.get("data"), (list, np.ndarray)):
+            try:
+                # decodeRequest already converted valid lists to arrays
+                return Dataset(body["data"])
+            except (TypeError, ValueError) as e:
+                raise RequestError(400, f"Invalid dataset: {e}")
+        raise RequestError(400, 'Provide "data" (list of numbers), "dataset" (string) or "datasetId".')
+
+    async def _dispatch(self, method, path, body):
+        if path == "/health":
+            return {
+                "status": "ok",
+                "tokenizerReady": self.tokenizerReady,
+                "tokenizerError": self.tokenizerError,
+                "cachedDatasets": len(self.datasets),
+                "tokenizeBatches": self.batcher.batches,
+                "tokenizeRequests": self.batcher.requests,
+            }
+        if path == "/operations":
+            return {"operations": SIMPLE_OPERATIONS + ADVANCED_OPERATIONS + ["tokenize"]}
+        if method != "POST":
+            raise RequestError(405, "Use POST with a JSON body.")
+
+        name = path.strip("/")
+        if name == "datasets":
+            dataset = await self._dataset(body)
+            key = await self._run(self.threadPool, len(dataset), _valuesKey, dataset.values)
+            self._cacheDataset(key, dataset)
+            return {"datasetId": key, "count": len(dataset)}
+        if name == "tokenize":
+            if not isinstance(body.get("text"), str):
+                raise RequestError(400, 'Provide "text" to tokenize.')
+            if self.tokenizerError is not None:
+                raise RequestError(503, f"Tokenizer unavailable: {self.tokenizerError}")
+            tokens = await self.batcher.tokenize(body["text"], int(body.get("alphaOrNum", 3)))
+            return {"tokens": tokens}
+        if name not in SIMPLE_OPERATIONS + ADVANCED_OPERATIONS:
+            raise RequestError(404, f"Unknown operation '{name}'.")
+        if name == "zScore" and "value" not in body:
+            raise RequestError(400, 'zScore needs a "value".')
+
+        values = (await self._dataset(body)).values
+        # only the options go along with the values, not the raw dataset again
+        params = {key: value for key, value in body.items() if key not in ("data", "dataset")}
+        executor = self.processPool if len(values) >= self.processThreshold else self.threadPool
+        # the executor hands back the encoded response, so long results are not encoded on the event loop
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, runOperationResponse, name, values, params
+        )
+
+    async def _handleConnection(self, reader, writer):
+        try:
+            while True:
+                requestLine = await reader.readline()
+                if not requestLine.strip():
+                    break
+                method, target, version = requestLine.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    field, _, value = line.decode("latin-1").partition(":")
+                    headers[field.strip().lower()] = value.strip()
+                keepAlive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                length = int(headers.get("content-length", 0))
+                try:
+                    if length > self.maxBodyBytes:
+                        keepAlive = False
+                        raise RequestError(413, "Request body too large.")
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = await self._run(self.processPool, len(raw), decodeRequest, raw) if raw else {}
+                    except ValueError:
+                        raise RequestError(400, "Request body must be JSON.")
+                    if not isinstance(body, dict):
+                        raise RequestError(400, "Request body must be a JSON object.")
+                    status, payload = 200, await self._dispatch(method, urlsplit(target).path, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, TypeError, KeyError, ZeroDivisionError) as e:
+                    status, payload = 400, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+
+                # operations return their response already encoded; the rest are small, apart from token
+                # lists, which would cost as much to hand to a worker as to encode here
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keepAlive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # client went away or sent something that is not HTTP
+        finally:
+            writer.close()
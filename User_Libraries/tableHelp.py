@@ -0,0 +1,260 @@
+# tableHelp.py
+# Columnar engine for the statistics of tabular (CSV) input.
+# 10/19/2026
+# The input is parsed once into one typed numpy buffer per column. Each column is then sorted
+# once by (group, value), and every statistic of every group comes from that one sorted copy
+# with vectorized reductions, so the number of groups does not add Python-level work.
+import csv
+
+import numpy as np
+
+
+# statistic columns of the results table, in display order
+STATISTIC_HEADERS = [
+    "Count", "Mean", "Median", "Mode", "Range", "Population Std Dev", "Sample Std Dev",
+    "Q1", "Q3", "IQR", "Lower Bound", "Upper Bound", "Outliers",
+]
+
+
+def _toColumn(cells):
+    """Convert a list of cells to a float64 array, or None when the cells are not all numbers."""
+    try:
+        return np.array(cells, dtype=np.float64)
+    except ValueError:
+        pass
+    try:
+        # empty cells are missing values, stored as NaN and skipped by every statistic
+        return np.array([cell if cell.strip() else "nan" for cell in cells], dtype=np.float64)
+    except ValueError:
+        return None
+
+
+def _medianAt(sortedValues, start, length):
+    """Median of sortedValues[start:start + length] for every group, given each group's start and length."""
+    if len(sortedValues) == 0:
+        return np.full(len(start), np.nan)
+    last = len(sortedValues) - 1
+    mid = start + length // 2
+    upper = sortedValues[np.clip(mid, 0, last)]
+    lower = sortedValues[np.clip(mid - 1, 0, last)]
+    median = np.where(length % 2 == 0, (lower + upper) / 2, upper)
+    return np.where(length > 0, median, np.nan)
+
+
+def _columnStatistics(values, codes, groupCount):
+    """
+    Every statistic of one column for every group at once, from a single sort by (group, value).
+    Returns a dict of arrays indexed by group code; modes are kept as runs and looked up per row.
+    """
+    keep = ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+    if groupCount > 1:
+        # sort by value, then stably by group; numpy radix-sorts the small integer codes
+        order = np.argsort(values)
+        order = order[np.argsort(codes[order], kind="stable")]
+        values, codes = values[order], codes[order]
+    else:
+        values = np.sort(values)
+    # each group's values are now one sorted run
+    bounds = np.searchsorted(codes, np.arange(groupCount + 1))
+    starts, counts = bounds[:-1], np.diff(bounds)
+    last = np.maximum(starts + counts - 1, 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.bincount(codes, weights=values, minlength=groupCount) / counts
+        deviations = values - means[codes]
+        squares = np.bincount(codes, weights=deviations * deviations, minlength=groupCount)
+        populationStd = np.sqrt(squares / counts)
+        sampleStd = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+        if len(values):
+            valueRange = np.where(counts > 0, values[last] - values[np.minimum(starts, len(values) - 1)], np.nan)
+        else:
+            valueRange = np.full(groupCount, np.nan)
+        # halves as in advancedStatisticsHelper.findQuartiles; a single value is its own quartiles
+        half = np.where(counts == 1, 1, counts // 2)
+        upperStart = np.where(counts == 1, 0, np.where(counts % 2 == 0, half, half + 1))
+        q1 = _medianAt(values, starts, half)
+        q3 = _medianAt(values, starts + upperStart, counts - upperStart)
+        iqr = q3 - q1
+        lowerBound = q1 - 1.5 * iqr
+        upperBound = q3 + 1.5 * iqr
+        outside = (values < lowerBound[codes]) | (values > upperBound[codes])
+
+    # equal values of a group are adjacent, so the mode is the longest run within the group
+    runStarts = np.flatnonzero(np.concatenate(
+        ([True], (values[1:] != values[:-1]) | (codes[1:] != codes[:-1]))
+    )) if len(values) else np.empty(0, dtype=np.int64)
+    runLengths = np.diff(np.append(runStarts, len(values)))
+    runCodes = codes[runStarts]
+    longestRun = np.zeros(groupCount, dtype=np.int64)
+    np.maximum.at(longestRun, runCodes, runLengths)
+    modeRuns = runStarts[runLengths == longestRun[runCodes]]
+
+    return {
+        "count": counts,
+        "mean": means,
+        "median": _medianAt(values, starts, counts),
+        "range": valueRange,
+        "populationStd": populationStd,
+        "sampleStd": sampleStd,
+        "q1": q1, "q3": q3, "iqr": iqr,
+        "lowerBound": lowerBound, "upperBound": upperBound,
+        "outliers": np.bincount(codes, weights=outside, minlength=groupCount).astype(np.int64),
+        "longestRun": longestRun,
+        "modeCodes": codes[modeRuns],
+        "modeValues": values[modeRuns],
+    }
+
+
+def _modeAt(statistics, group):
+    """Mode of one group, following SimpleStatisticsHelper.mode."""
+    if statistics["longestRun"][group] <= 1:
+        return None
+    codes = statistics["modeCodes"]
+    modes = statistics["modeValues"][
+        np.searchsorted(codes, group, side="left"):np.searchsorted(codes, group, side="right")
+    ].tolist()
+    return modes if len(modes) > 1 else modes[0]
+
+
+def _number(value):
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class StatisticsRows:
+    """
+    The rows of a statistics table, one per group and column, built only when they are read.
+    A table with thousands of groups therefore costs no Python objects until rows are shown.
+    """
+
+    def __init__(self, keys, names, statistics):
+        self.keys = keys  # group keys, or None without grouping
+        self.names = names
+        self.statistics = statistics  # the _columnStatistics of each column
+
+    def __len__(self):
+        return (1 if self.keys is None else len(self.keys)) * len(self.names)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        group, column = divmod(index, len(self.names))
+        stats = self.statistics[column]
+        row = [self.names[column], int(stats["count"][group])] + [
+            _number(stats[name][group]) for name in ("mean", "median")
+        ] + [_modeAt(stats, group)] + [
+            _number(stats[name][group]) for name in (
+                "range", "populationStd", "sampleStd", "q1", "q3", "iqr", "lowerBound", "upperBound"
+            )
+        ] + [int(stats["outliers"][group])]
+        return row if self.keys is None else [self.keys[group]] + row
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+
+class ColumnarTable:
+    """A table stored as one numpy array per column; numeric columns are float64."""
+
+    # rows converted to column buffers at a time while parsing
+    blockRows = 1 << 16
+
+    def __init__(self, columns):
+        """Wrap a {name: array} mapping. Columns that are not numeric are kept as text."""
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if values.dtype.kind in "biuf":
+                values = values.astype(np.float64)
+            self.columns[name] = values
+
+    @classmethod
+    def _fromLines(cls, lines, delimiter, hasHeader):
+        reader = csv.reader(lines, delimiter=delimiter)
+        headers = next(reader, None) if hasHeader else None
+        width = len(headers) if headers else None
+        buffers, textColumns, block = None, set(), []
+        # the cells of each block as read, while the column is still numeric; a later text cell turns
+        # the column into text, and its earlier blocks must keep their original spelling ("001", "1")
+        rawCells = None
+
+        def flush():
+            # transposing a whole block lets numpy convert each column in one call
+            cells = zip(*(row + [""] * (width - len(row)) for row in block))
+            for index, column in enumerate(cells):
+                converted = None if index in textColumns else _toColumn(column)
+                if converted is None:
+                    if index not in textColumns:
+                        textColumns.add(index)
+                        buffers[index] = [np.array(part, dtype=object) for part in rawCells[index]]
+                        rawCells[index] = None
+                    converted = np.array(column, dtype=object)
+                else:
+                    rawCells[index].append(column)
+                buffers[index].append(converted)
+
+        for lineNumber, row in enumerate(reader, start=2 if hasHeader else 1):
+            if not row:
+                continue
+            if width is None:
+                width = len(row)
+            if len(row) > width:
+                raise ValueError(f"Row {lineNumber} has {len(row)} cells, expected {width}.")
+            if buffers is None:
+                buffers = [[] for _ in range(width)]
+                rawCells = [[] for _ in range(width)]
+            block.append(row)
+            if len(block) >= cls.blockRows:
+                flush()
+                block = []
+        if block:
+            flush()
+
+        names = list(headers or []) or [f"Column {index + 1}" for index in range(width or 0)]
+        if buffers is None:
+            return cls({name: np.empty(0) for name in names})
+        return cls({
+            name: np.concatenate(parts).astype(str) if index in textColumns else np.concatenate(parts)
+            for index, (name, parts) in enumerate(zip(names, buffers))
+        })
+
+    @classmethod
+    def fromCsv(cls, path, delimiter=",", hasHeader=True):
+        """Parse a CSV file once into column buffers."""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return cls._fromLines(f, delimiter, hasHeader)
+
+    @classmethod
+    def fromCsvText(cls, text, delimiter=",", hasHeader=True):
+        """Parse CSV text (for example a paste) once into column buffers."""
+        return cls._fromLines(text.splitlines(), delimiter, hasHeader)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def numericColumns(self):
+        """Names of the columns holding numbers."""
+        return [name for name, values in self.columns.items() if values.dtype == np.float64]
+
+    def statisticsTable(self, groupBy=None):
+        """
+        Calculate the statistics of every numeric column, optionally per value of the groupBy column.
+        Each column is sorted once by (group, value), which gives every group's statistics together.
+        Returns (headers, rows); rows is a StatisticsRows sequence that builds each row when read.
+        """
+        names = [name for name in self.numericColumns() if name != groupBy]
+        if groupBy is None:
+            keys, codes = None, np.zeros(len(self), dtype=np.int64)
+        elif groupBy not in self.columns:
+            raise ValueError(f"Unknown column '{groupBy}'.")
+        else:
+            keys, codes = np.unique(self.columns[groupBy], return_inverse=True)
+            codes = codes.astype(np.min_scalar_type(max(len(keys) - 1, 0)))
+            keys = keys.tolist()
+        groupCount = 1 if keys is None else len(keys)
+        statistics = [_columnStatistics(self.columns[name], codes, groupCount) for name in names]
+        headers = ["Column"] + STATISTIC_HEADERS
+        return (headers if keys is None else [groupBy] + headers), StatisticsRows(keys, names, statistics)
@@ -0,0 +1,154 @@
+# tokenCache.py
+# On-disk cache for the results of SimpleStatisticsHelper.tokenize.
+# 10/19/2026
+# Entries are keyed by a hash of the text, the tokenizer identity and the alphaOrNum mode and
+# stored as compact binary arrays. Files are written to a temporary name and renamed into place,
+# so several app instances can share one cache directory without reading half-written entries.
+import hashlib
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+
+MAGIC = b"STOK"
+# bump when the output of tokenize changes, so old entries stop matching
+CACHE_VERSION = 1
+NUMBERS, STRINGS = 0, 1
+HEADER = struct.Struct("<4sBBQ")
+
+
+class TokenCache:
+    """Size-bounded, least recently used cache of tokenization results in a directory."""
+
+    # a temporary file this old (in seconds) was left by an instance that died before renaming it
+    staleSeconds = 60 * 60
+
+    def __init__(self, directory=None, maxBytes=256 * 1024 * 1024):
+        """Nothing is touched on disk until the first entry is written."""
+        if directory is None:
+            directory = os.environ.get(
+                "STATS_TOKEN_CACHE",
+                os.path.join(os.path.expanduser("~"), ".cache", "StatisticsCalculator", "tokens"),
+            )
+        self.directory = directory
+        self.maxBytes = maxBytes
+
+    @staticmethod
+    def key(text, tokenizerName, alphaOrNum):
+        """Hash identifying one tokenization of a text."""
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}\0{tokenizerName}\0{alphaOrNum}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".tok")
+
+    @staticmethod
+    def _encode(tokens):
+        if all(isinstance(t, float) for t in tokens) and tokens:
+            payload = np.asarray(tokens, dtype="<f8").tobytes()
+            return HEADER.pack(MAGIC, CACHE_VERSION, NUMBERS, len(tokens)) + payload
+        encoded = [str(t).encode("utf-8", "surrogatepass") for t in tokens]
+        lengths = np.fromiter((len(e) for e in encoded), dtype="<u4", count=len(encoded))
+        return HEADER.pack(MAGIC, CACHE_VERSION, STRINGS, len(tokens)) + lengths.tobytes() + b"".join(encoded)
+
+    @staticmethod
+    def _decode(blob):
+        magic, version, kind, count = HEADER.unpack_from(blob)
+        if magic != MAGIC or version != CACHE_VERSION:
+            raise ValueError("Not a token cache entry.")
+        body = memoryview(blob)[HEADER.size:]
+        if kind == NUMBERS:
+            if len(body) != 8 * count:
+                raise ValueError("Truncated token cache entry.")
+            return np.frombuffer(body, dtype="<f8").tolist()
+        lengths = np.frombuffer(body[:4 * count], dtype="<u4")
+        ends = np.cumsum(lengths, dtype=np.int64).tolist()
+        text = body[4 * count:]
+        if len(ends) and ends[-1] != len(text):
+            raise ValueError("Truncated token cache entry.")
+        text = bytes(text)
+        starts = [0] + ends[:-1]
+        return [text[s:e].decode("utf-8", "surrogatepass") for s, e in zip(starts, ends)]
+
+    def get(self, text, tokenizerName, alphaOrNum):
+        """Return the cached tokens, or None when this tokenization was not cached."""
+        path = self._path(self.key(text, tokenizerName, alphaOrNum))
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            tokens = self._decode(blob)
+            # refresh the modification time so eviction removes the least recently used entries
+            os.utime(path)
+        except (OSError, ValueError, struct.error):
+            # missing, evicted by another instance or unreadable: treat it as a miss
+            return None
+        return tokens
+
+    def put(self, text, tokenizerName, alphaOrNum, tokens):
+        """Store tokens for a text, then evict old entries if the cache grew too large."""
+        blob = self._encode(tokens)
+        if len(blob) > self.maxBytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                f.write(blob)
+            os.replace(temporary, self._path(self.key(text, tokenizerName, alphaOrNum)))
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Delete abandoned temporary files, then the least recently used entries until the cache
+        fits in maxBytes. Temporary files still being written count towards the size.
+        """
+        entries, writing = [], 0
+        now = time.time()
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if not entry.name.endswith((".tok", ".tmp")):
+                        continue
+                    try:
+                        info = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.name.endswith(".tok"):
+                        entries.append((info.st_mtime, info.st_size, entry.path))
+                    elif now - info.st_mtime > self.staleSeconds:
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+                    else:
+                        writing += info.st_size
+        except OSError:
+            return
+        total = writing + sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # another instance removed it first
+            total -= size
+
+    def clear(self):
+        """Remove every cached entry."""
+        maxBytes, self.maxBytes = self.maxBytes, 0
+        try:
+            self.evict()
+        finally:
+            self.maxBytes = maxBytes
@@ -0,0 +1,32 @@
+#service.py
+#Runs the statistics engine as a local HTTP/JSON service, without the GUI.
+# 10/19/2026
+import argparse
+import asyncio
+
+from User_Libraries.statsService import StatisticsService
+
+
+async def serve(args):
+    service = StatisticsService(workers=args.workers, cacheSize=args.cache_size)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Statistics service listening on {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Statistics Helper JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="serve on a Unix socket at this path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="size of the worker pools")
+    parser.add_argument("--cache-size", type=int, default=32, help="number of datasets kept parsed")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass